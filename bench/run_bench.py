@@ -0,0 +1,203 @@
+"""Benchmark the full run_autograder pipeline on reference submissions.
+
+    python3 /autograder/bench/run_bench.py -n 5
+    python3 /autograder/bench/run_bench.py -n 3 --submissions correct,heavy_pages \\
+        --env AUTOGRADER_DOM_MODE=browser
+    python3 /autograder/bench/run_bench.py -n 5 --submissions correct --trace-overhead
+
+Runs inside the autograder image. Each reference submission is installed as
+/autograder/submission, run_autograder is run ``-n`` times, and the report
+gives p50/p95 wall time, peak RSS of the pipeline and the per-phase timings
+test_main.py writes to ``extra_data.timing`` in results.json.
+``--trace-overhead`` runs everything with tracing off and on-failure (see
+failure_trace.py) and reports what tracing adds to passing runs.
+
+``submissions/correct`` is a full solution; every other directory under
+``submissions/`` holds only the files it changes on top of it:
+
+- slow_start: sleeps before starting uvicorn
+- import_crash: fails at import, so the server never comes up
+- infinite_loop: world_clock.js never returns control to the browser
+- heavy_pages: every page carries ~20k extra elements
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SUBMISSIONS_DIR = os.path.join(BENCH_DIR, "submissions")
+BASE_SUBMISSION = "correct"
+DEFAULT_SUBMISSIONS = ["correct", "slow_start", "import_crash", "infinite_loop", "heavy_pages"]
+
+# AUTOGRADER_TRACE settings compared by --trace-overhead, baseline first.
+TRACE_MODES = ("off", "on-failure")
+
+# extra_data.timing fields reported as per-phase means.
+PHASES = ["server_startup_seconds", "browser_launch_seconds", "tests_seconds", "server_seconds"]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def assemble(name, target):
+    """Write the reference submission ``name`` to the ``target`` directory."""
+    shutil.copytree(os.path.join(SUBMISSIONS_DIR, BASE_SUBMISSION), target)
+    if name != BASE_SUBMISSION:
+        shutil.copytree(os.path.join(SUBMISSIONS_DIR, name), target, dirs_exist_ok=True)
+
+
+def run_once(root, env):
+    """Run run_autograder once; return wall seconds, peak RSS and results."""
+    source = os.path.join(root, "source")
+    before = set(os.listdir(source))
+    results_path = os.path.join(root, "results", "results.json")
+    if os.path.exists(results_path):
+        os.remove(results_path)
+
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        ["bash", os.path.join(root, "run_autograder")],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    # wait4 reports the peak RSS of the pipeline's largest process.
+    _, _, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - started
+
+    # run_autograder copies the submission into source/; undo that.
+    for entry in set(os.listdir(source)) - before:
+        path = os.path.join(source, entry)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+
+    results = None
+    if os.path.exists(results_path):
+        with open(results_path) as f:
+            results = json.load(f)
+    return {"wall_seconds": wall, "peak_rss_mb": usage.ru_maxrss / 1024, "results": results}
+
+
+def bench_submission(name, runs, root, env):
+    """Benchmark one reference submission; returns its report row."""
+    submission = os.path.join(root, "submission")
+    backup = submission + ".bench-backup"
+    if os.path.exists(submission):
+        os.rename(submission, backup)
+    samples = []
+    try:
+        assemble(name, submission)
+        for _ in range(runs):
+            samples.append(run_once(root, env))
+    finally:
+        shutil.rmtree(submission, ignore_errors=True)
+        if os.path.exists(backup):
+            os.rename(backup, submission)
+
+    walls = [sample["wall_seconds"] for sample in samples]
+    row = {
+        "submission": name,
+        "runs": runs,
+        "wall_p50": percentile(walls, 50),
+        "wall_p95": percentile(walls, 95),
+        "peak_rss_mb": max(sample["peak_rss_mb"] for sample in samples),
+        "score": [sample["results"] and sample["results"].get("score") for sample in samples],
+        "phases": {},
+    }
+    for phase in PHASES:
+        values = [
+            sample["results"]["extra_data"]["timing"].get(phase)
+            for sample in samples
+            if sample["results"] and "timing" in sample["results"].get("extra_data", {})
+        ]
+        values = [value for value in values if value is not None]
+        if values:
+            row["phases"][phase] = sum(values) / len(values)
+    return row
+
+
+def print_report(rows):
+    header = f"{'submission':<24}{'p50 s':>8}{'p95 s':>8}{'RSS MB':>9}  phases (mean s)"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        phases = ", ".join(f"{k.replace('_seconds', '')}={v:.2f}" for k, v in row["phases"].items())
+        name = row["submission"] + (f" [{row['trace']}]" if "trace" in row else "")
+        print(
+            f"{name:<24}{row['wall_p50']:>8.2f}{row['wall_p95']:>8.2f}"
+            f"{row['peak_rss_mb']:>9.0f}  {phases}"
+        )
+
+
+def print_trace_overhead(rows):
+    """p50 wall time added by on-failure tracing, per submission."""
+    print()
+    for off, on in zip(rows[::2], rows[1::2]):
+        added = on["wall_p50"] - off["wall_p50"]
+        print(
+            f"{off['submission']}: on-failure tracing adds {added:+.2f} s "
+            f"({added / off['wall_p50']:+.1%}) at p50"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the autograder pipeline")
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("--submissions", default=",".join(DEFAULT_SUBMISSIONS))
+    parser.add_argument("--root", default="/autograder", help="autograder root directory")
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="extra environment for run_autograder (repeatable)",
+    )
+    parser.add_argument("--output", help="also write the report as JSON here")
+    parser.add_argument(
+        "--trace-overhead",
+        action="store_true",
+        help="run every submission with AUTOGRADER_TRACE=off and =on-failure and compare",
+    )
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    # Every run grades from scratch unless --env says otherwise.
+    env.setdefault("AUTOGRADER_RESULT_CACHE", "0")
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+
+    rows = []
+    for name in args.submissions.split(","):
+        print(f"Benchmarking {name} ({args.runs} runs)...", file=sys.stderr, flush=True)
+        if not args.trace_overhead:
+            rows.append(bench_submission(name.strip(), args.runs, args.root, env))
+            continue
+        for mode in TRACE_MODES:
+            row = bench_submission(name.strip(), args.runs, args.root, dict(env, AUTOGRADER_TRACE=mode))
+            row["trace"] = mode
+            rows.append(row)
+    print_report(rows)
+    if args.trace_overhead:
+        print_trace_overhead(rows)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Reference solution used by the benchmark harness."""
+
+import json
+import os
+from urllib.parse import quote
+from urllib.request import urlopen
+
+from fastapi import FastAPI, Form
+from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.staticfiles import StaticFiles
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Extra markup injected at <!-- filler --> (the heavy_pages variant sets it).
+PAGE_FILLER = ""
+
+# run_autograder points this at its offline mock of the stock API.
+STOCK_API_URL = os.environ.get("STOCK_API_URL", "https://financialmodelingprep.com")
+API_KEY = os.environ.get("API_KEY", "")
+
+app = FastAPI()
+app.mount("/static", StaticFiles(directory=os.path.join(HERE, "static")), name="static")
+
+stocks = {}
+
+
+def lookup(symbol):
+    url = f"{STOCK_API_URL}/api/v3/profile/{quote(symbol)}?apikey={API_KEY}"
+    with urlopen(url, timeout=10) as response:
+        profiles = json.load(response)
+    if not profiles:
+        return {"company name": symbol, "industry": "Unknown", "sector": "Unknown", "stock price": 0.0}
+    profile = profiles[0]
+    return {
+        "company name": profile["companyName"],
+        "industry": profile["industry"],
+        "sector": profile["sector"],
+        "stock price": profile["price"],
+    }
+
+
+def render(name):
+    with open(os.path.join(HERE, "templates", name)) as f:
+        return HTMLResponse(f.read().replace("<!-- filler -->", PAGE_FILLER))
+
+
+@app.get("/world-clock")
+def world_clock():
+    return render("world_clock.html")
+
+
+@app.get("/puppy-pong")
+def puppy_pong():
+    return render("puppy_pong.html")
+
+
+@app.get("/stock")
+def stock_form():
+    return render("stock.html")
+
+
+@app.post("/stock")
+def submit_stocks(symbol1: str = Form(...), symbol2: str = Form(...), symbol3: str = Form(...)):
+    for number, symbol in enumerate((symbol1, symbol2, symbol3), start=1):
+        stocks[number] = lookup(symbol.strip().upper())
+    return RedirectResponse("/stock/page", status_code=303)
+
+
+@app.get("/stock/page")
+def stock_page():
+    return render("stock_page.html")
+
+
+@app.get("/stock/{number}")
+def stock(number: int):
+    return stocks.get(number, {})
@@ -0,0 +1,35 @@
+const puppy = document.querySelector("img");
+const player = document.querySelector("#player");
+const scoreText = document.querySelector("#score");
+const timeText = document.querySelector("#time");
+
+let x = 80, y = 80, dx = 3, dy = 3;
+let score = 0, seconds = 0;
+
+document.addEventListener("mousemove", (event) => {
+    player.style.left = `${event.clientX - player.offsetWidth / 2}px`;
+});
+
+setInterval(() => {
+    seconds += 1;
+    timeText.textContent = `Time: ${seconds} secs`;
+}, 1000);
+
+setInterval(() => {
+    const maxX = window.innerWidth - puppy.offsetWidth;
+    const floor = window.innerHeight - 40 - puppy.offsetHeight;
+    x += dx;
+    y += dy;
+    if (x <= 0 || x >= maxX) dx = -dx;
+    if (y <= 0) dy = -dy;
+    if (y >= floor) {
+        dy = -dy;
+        const playerLeft = player.offsetLeft;
+        if (x + puppy.offsetWidth > playerLeft && x < playerLeft + player.offsetWidth) {
+            score += 1;
+            scoreText.textContent = `Score: ${score}`;
+        }
+    }
+    puppy.style.left = `${x}px`;
+    puppy.style.top = `${y}px`;
+}, 20);
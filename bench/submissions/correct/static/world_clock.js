@@ -0,0 +1,42 @@
+const time_diffs = {
+    PST: -8, MST: -7, CST: -6, EST: -5, UTC: 0, GMT: 0, CET: 1, IST: 5.5, JST: 9,
+};
+
+const clocks = document.querySelector("#clocks");
+const template = document.querySelector("template");
+const [addForm, removeForm] = document.querySelectorAll("form");
+
+function render(clock) {
+    const offset = Number(clock.dataset.offset);
+    const now = new Date(Date.now() + offset * 3600 * 1000);
+    clock.querySelector(".time").textContent = now.toISOString().substring(11, 19);
+}
+
+addForm.addEventListener("submit", (event) => {
+    event.preventDefault();
+    const input = addForm.querySelector("input[type='text']");
+    const zone = input.value.trim().toUpperCase();
+    if (!(zone in time_diffs)) {
+        return;
+    }
+    const clock = template.content.querySelector("li").cloneNode(true);
+    const offset = time_diffs[zone];
+    clock.dataset.offset = offset;
+    clock.querySelector(".timezone").textContent = zone;
+    clock.querySelector(".offset").textContent = `UTC${offset >= 0 ? "+" : ""}${offset}`;
+    render(clock);
+    clocks.appendChild(clock);
+    input.value = "";
+});
+
+removeForm.addEventListener("submit", (event) => {
+    event.preventDefault();
+    const input = removeForm.querySelector("input[type='number']");
+    const index = Number(input.value);
+    if (Number.isInteger(index) && index >= 1 && index <= clocks.children.length) {
+        clocks.children[index - 1].remove();
+    }
+    input.value = "";
+});
+
+setInterval(() => clocks.querySelectorAll("li").forEach(render), 1000);
@@ -0,0 +1,12 @@
+import uvicorn
+
+import server
+
+# Pads every page with a large block of hidden markup.
+server.PAGE_FILLER = "\n".join(
+    f'<div class="filler" hidden><span>row {i}</span><span>{"x" * 64}</span></div>'
+    for i in range(20000)
+)
+
+if __name__ == "__main__":
+    uvicorn.run(server.app, host="0.0.0.0", port=6543)
@@ -0,0 +1,7 @@
+import uvicorn
+
+from server import app
+import stock_api_client  # noqa: F401  (module the student forgot to submit)
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="0.0.0.0", port=6543)
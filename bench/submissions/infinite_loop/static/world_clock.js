@@ -0,0 +1,5 @@
+// A student script that never yields back to the event loop.
+let ticks = 0;
+while (true) {
+    ticks += 1;
+}
@@ -0,0 +1,13 @@
+import os
+import time
+
+import uvicorn
+
+# Simulates a server that does expensive work (model loading, API warm-up)
+# before it starts listening.
+time.sleep(float(os.environ.get("BENCH_SLOW_START_SECONDS", "8")))
+
+from server import app  # noqa: E402
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="0.0.0.0", port=6543)
@@ -0,0 +1,255 @@
+"""Grade a directory of submissions in one container with warm browsers.
+
+    python3 batch_grade.py /path/to/submissions --output-dir out --concurrency 4
+
+Each subdirectory of the submissions directory is one student. Up to
+``--concurrency`` students are graded at once by worker processes; every
+worker keeps its own browser running across students and starts each
+student's app.py on a free port of its own. The output directory gets one
+``<submission>.json`` in Gradescope's results format per student and a
+``summary.csv``.
+
+One mock stock API (mock_stock_api.py) serves all students; its address is
+passed to every server as STOCK_API_URL.
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+import failure_trace
+import grader_base
+import log_capture
+import mock_stock_api
+import network
+import preflight
+import timing
+from browser_pool import get_pool, shutdown_pool
+from grading_runner import GradingTestRunner
+from parallel_runner import iter_tests
+from ports import base_url, free_port
+from wait_for_server import READY, STATUS_NAMES, wait_for_server
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVE_SUBMISSION = os.path.join(SOURCE_DIR, "serve_submission.py")
+SUMMARY_FIELDS = [
+    "submission",
+    "server",
+    "score",
+    "max_score",
+    "passed",
+    "failed",
+    "time_to_ready_seconds",
+    "wall_seconds",
+]
+
+
+def _stop_server(server):
+    """Terminate the server and anything it spawned (e.g. uvicorn reloaders)."""
+    if server.poll() is None:
+        try:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait(timeout=5)
+        except (ProcessLookupError, subprocess.TimeoutExpired):
+            os.killpg(server.pid, signal.SIGKILL)
+            server.wait()
+
+
+def grade_submission(submission, output_path, port=None, timeout=30.0):
+    """Grade one submission directory and write its results.json.
+
+    The server runs on ``port``, or on a free port if none is given.
+    """
+    started = time.time()
+    if port is None:
+        port = free_port()
+    workdir = tempfile.mkdtemp(prefix="submission-")
+    server = None
+    try:
+        shutil.copytree(submission, workdir, dirs_exist_ok=True)
+        log_path = os.path.join(workdir, "fastapi.log")
+        server_metrics = {"status": "missing_app", "port": port}
+
+        if os.path.exists(os.path.join(workdir, "app.py")):
+            server = subprocess.Popen(
+                [sys.executable, SERVE_SUBMISSION, "--port", str(port), "app.py"],
+                cwd=workdir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+            log_thread = log_capture.LogCapture(log_path).follow_in_background(server.stdout)
+            status, waited, attempts = wait_for_server(
+                base_url(port) + "/docs", server.pid, timeout
+            )
+            server_metrics = {
+                "status": STATUS_NAMES[status],
+                "port": port,
+                "time_to_ready_seconds": round(waited, 3) if status == READY else None,
+                "probe_attempts": attempts,
+            }
+
+        if server_metrics["status"] != "ready":
+            if server is not None:
+                # The whole log is only on disk once the server has gone.
+                _stop_server(server)
+                log_thread.join()
+            results = log_capture.failure_results(
+                log_capture.read_log(log_path), server_metrics, time.time() - started
+            )
+            with open(output_path, "w") as f:
+                json.dump(results, f, indent=4)
+        else:
+            grader_base.set_base_url(base_url(port))
+            log_capture.watch(log_path)
+            suite = unittest.defaultTestLoader.discover(
+                start_dir=SOURCE_DIR, pattern="test_*.py"
+            )
+            preflight.run_preflight(
+                base_url(port), preflight.required_routes(iter_tests(suite))
+            )
+            pool = get_pool()
+            network.reset()
+            # The browser stays up across submissions; count per submission.
+            pool.reset_stats()
+            failure_trace.reset()
+            results = {}
+
+            def add_metadata(data):
+                data["extra_data"] = {
+                    "server": server_metrics,
+                    "browser_pool": pool.stats(),
+                    "preflight": preflight.summary(),
+                    "network": network.summary(),
+                }
+                data["extra_data"]["timing"] = timing.run_summary(data, started)
+                results.update(data)
+
+            with open(output_path, "w") as f:
+                GradingTestRunner(
+                    visibility="visible", stream=f, post_processor=add_metadata
+                ).run(suite)
+    finally:
+        if server is not None:
+            _stop_server(server)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    tests = results["tests"]
+    return {
+        "submission": os.path.basename(os.path.normpath(submission)),
+        "server": server_metrics["status"],
+        "score": results["score"],
+        "max_score": sum(test.get("max_score", 0) for test in tests),
+        "passed": sum(test.get("status") == "passed" for test in tests),
+        "failed": sum(test.get("status") == "failed" for test in tests),
+        "time_to_ready_seconds": server_metrics.get("time_to_ready_seconds"),
+        "wall_seconds": round(time.time() - started, 3),
+    }
+
+
+def _worker_main(worker_id, jobs, summaries, timeout):
+    """Grade submissions from ``jobs`` until the sentinel."""
+    try:
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            index, submission, output_path, port = job
+            try:
+                summary = grade_submission(submission, output_path, port, timeout)
+            except Exception as error:
+                summary = {
+                    "submission": os.path.basename(os.path.normpath(submission)),
+                    "server": f"grader error: {error}",
+                }
+            summaries.put((index, summary))
+    finally:
+        summaries.put((None, worker_id))
+        shutdown_pool()
+
+
+def grade_batch(submissions_dir, output_dir, concurrency=1, timeout=30.0):
+    """Grade every submission under ``submissions_dir``; return the summaries."""
+    os.makedirs(output_dir, exist_ok=True)
+    submissions = sorted(
+        os.path.join(submissions_dir, name)
+        for name in os.listdir(submissions_dir)
+        if os.path.isdir(os.path.join(submissions_dir, name))
+    )
+    concurrency = max(1, min(concurrency, len(submissions)))
+
+    # Started before forking; the student servers inherit STOCK_API_URL.
+    stock_api = mock_stock_api.start()
+    os.environ["STOCK_API_URL"] = mock_stock_api.url(stock_api)
+
+    ctx = multiprocessing.get_context("fork")
+    jobs = ctx.Queue()
+    summaries = ctx.Queue()
+    for index, submission in enumerate(submissions):
+        output_path = os.path.join(output_dir, os.path.basename(submission) + ".json")
+        # Ports are allocated here, in one process, so no two workers share one.
+        jobs.put((index, submission, output_path, free_port()))
+    for _ in range(concurrency):
+        jobs.put(None)
+
+    procs = [
+        ctx.Process(target=_worker_main, args=(n, jobs, summaries, timeout))
+        for n in range(concurrency)
+    ]
+    for proc in procs:
+        proc.start()
+
+    results = {}
+    finished = 0
+    while finished < concurrency:
+        try:
+            index, summary = summaries.get(timeout=1)
+        except queue.Empty:
+            if not any(proc.is_alive() for proc in procs) and summaries.empty():
+                break
+            continue
+        if index is None:
+            finished += 1
+        else:
+            results[index] = summary
+            print(f"{summary['submission']}: {summary.get('score', '-')}", flush=True)
+    for proc in procs:
+        proc.join()
+    stock_api.shutdown()
+
+    rows = [
+        results.get(index, {"submission": os.path.basename(path), "server": "grader crashed"})
+        for index, path in enumerate(submissions)
+    ]
+    with open(os.path.join(output_dir, "summary.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade a directory of submissions")
+    parser.add_argument("submissions", help="directory with one subdirectory per student")
+    parser.add_argument("--output-dir", default="/autograder/results/batch")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=30.0, help="server start timeout")
+    args = parser.parse_args()
+
+    started = time.time()
+    rows = grade_batch(args.submissions, args.output_dir, args.concurrency, args.timeout)
+    print(f"Graded {len(rows)} submissions in {time.time() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import time
+from playwright.sync_api import sync_playwright
+
+
+class BrowserPool:
+    """One Playwright browser shared by every suite in a grading run.
+
+    The browser is launched once; each TestCase class gets its own
+    BrowserContext from ``new_context`` so cookies, storage and pages stay
+    isolated between classes exactly as they did with one browser per class.
+    """
+
+    def __init__(self, browser_type="firefox", headless=True):
+        self.browser_type = browser_type
+        self.headless = headless
+        self.playwright = None
+        self.browser = None
+        self.launch_seconds = 0.0
+        # Launches and contexts since the last ``reset_stats``.
+        self.launches = 0
+        self.contexts_created = 0
+
+    def start(self):
+        """Start Playwright and launch the browser if not already running."""
+        if self.browser is not None:
+            return self.browser
+        started = time.perf_counter()
+        self.playwright = sync_playwright().start()
+        launcher = getattr(self.playwright, self.browser_type)
+        try:
+            self.browser = launcher.launch(headless=self.headless)
+        except Exception:
+            # Leave no half-started Playwright behind; a later start() (the
+            # grader daemon's next job) would refuse to run inside its loop.
+            self.playwright.stop()
+            self.playwright = None
+            raise
+        self.launch_seconds = time.perf_counter() - started
+        self.launches += 1
+        return self.browser
+
+    def new_context(self, **options):
+        """Return a fresh, isolated BrowserContext on the shared browser."""
+        self.start()
+        self.contexts_created += 1
+        return self.browser.new_context(**options)
+
+    def stop(self):
+        """Close the browser and stop Playwright."""
+        if self.browser is not None:
+            self.browser.close()
+            self.browser = None
+        if self.playwright is not None:
+            self.playwright.stop()
+            self.playwright = None
+
+    def reset_stats(self):
+        """Start counting for a new grading run; the browser stays up."""
+        self.launches = 0
+        self.contexts_created = 0
+
+    def stats(self):
+        """Launch metrics of the current run for the results metadata."""
+        return {
+            "browser": self.browser_type,
+            "browser_launches": self.launches,
+            # Only what this run paid; a warm browser costs it nothing.
+            "launch_seconds": round(self.launch_seconds if self.launches else 0.0, 3),
+            "contexts_created": self.contexts_created,
+            # Every context without a launch of its own would have been a
+            # cold launch when each TestCase class started its own browser.
+            "estimated_seconds_saved": round(
+                self.launch_seconds * max(self.contexts_created - self.launches, 0), 3
+            ),
+        }
+
+
+_pool = None
+
+
+def get_pool():
+    """Return the session-wide pool, creating it on first use.
+
+    test_main.py starts the pool before running the suites; a suite run on
+    its own (e.g. ``python3 -m unittest test_clock_css``) creates it lazily.
+    """
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
+
+
+def shutdown_pool():
+    """Stop the session-wide pool if one was created."""
+    global _pool
+    if _pool is not None:
+        _pool.stop()
+        _pool = None
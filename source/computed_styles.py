@@ -0,0 +1,288 @@
+"""Collect many computed styles in a single ``page.evaluate`` round trip.
+
+A style spec maps selectors to the properties to read, either as a dict or
+as one ``selector: prop, prop`` line per selector::
+
+    #deathzone: backgroundColor, position, bottom, clientWidth
+    p: color
+    window: innerWidth, innerHeight
+
+Each property is read from ``getComputedStyle`` when it is a CSS property
+and from the element itself otherwise (``clientWidth``, ``offsetHeight``).
+The pseudo-selector ``window`` reads properties of ``window``.
+
+A selector ending in ``:hover``, ``:focus`` or ``:active`` reads the styles
+its matches would have in that state, without moving the mouse::
+
+    input[type="submit"]:hover: backgroundColor
+
+They are resolved from the page's stylesheets (``PSEUDO_MODE`` "cssom"):
+every rule that would match the element in that state takes part in the
+cascade (!important, specificity, source order, inline style) and the
+winning declaration is resolved to a computed value on the element itself,
+all inside the one ``evaluate``. "interact" instead hovers, focuses or
+presses each element for real, and "parity" does both and fails on any
+difference, which is how the stylesheet resolution is checked. The page
+cannot read the rules of a stylesheet from another origin (e.g. a CDN), so
+when it links one, "cssom" reads the spec's dynamic selectors by
+interaction instead.
+"""
+
+DYNAMIC_PSEUDO_CLASSES = (":hover", ":focus", ":active")
+
+COLLECT_STYLES_JS = r"""
+(spec) => {
+    const kebab = (prop) => prop.replace(/[A-Z]/g, (m) => '-' + m.toLowerCase());
+
+    // Split a selector list on top-level commas.
+    const splitSelectors = (text) => {
+        const parts = [];
+        let depth = 0, start = 0;
+        for (let i = 0; i < text.length; i++) {
+            const ch = text[i];
+            if (ch === '(' || ch === '[') depth++;
+            else if (ch === ')' || ch === ']') depth--;
+            else if (ch === ',' && depth === 0) {
+                parts.push(text.slice(start, i));
+                start = i + 1;
+            }
+        }
+        parts.push(text.slice(start));
+        return parts.map((part) => part.trim()).filter(Boolean);
+    };
+
+    const specificity = (selector) => {
+        let a = 0, b = 0, c = 0;
+        let s = selector.replace(/::[\w-]+(\([^)]*\))?/g, () => { c++; return ' '; });
+        s = s.replace(/\[[^\]]*\]/g, () => { b++; return ' '; });
+        s = s.replace(/:where\([^()]*\)/g, ' ');
+        s = s.replace(/:(?:not|is|has)\(([^()]*)\)/g, (m, inner) => {
+            const best = splitSelectors(inner).map(specificity)
+                .reduce((x, y) => (compare(x, y) >= 0 ? x : y), [0, 0, 0]);
+            a += best[0]; b += best[1]; c += best[2];
+            return ' ';
+        });
+        a += (s.match(/#[\w-]+/g) || []).length;
+        b += (s.match(/\.[\w-]+|:[\w-]+(\([^)]*\))?/g) || []).length;
+        c += (s.match(/(^|[\s>+~])[a-zA-Z][\w-]*/g) || []).length;
+        return [a, b, c];
+    };
+    const compare = (x, y) => x[0] - y[0] || x[1] - y[1] || x[2] - y[2];
+    // Whether declaration ``a`` wins the cascade over ``b``.
+    const beats = (a, b) => {
+        if (!b) return true;
+        if (a.important !== b.important) return a.important;
+        const bySpecificity = compare(a.spec, b.spec);
+        return bySpecificity > 0 || (bySpecificity === 0 && a.order >= b.order);
+    };
+
+    let styleRules = null;
+    // Stylesheets whose rules the page may not read (other origins).
+    const unreadable = [];
+    const allStyleRules = () => {
+        if (styleRules) return styleRules;
+        styleRules = [];
+        const walk = (rules) => {
+            for (const rule of rules) {
+                if (rule instanceof CSSStyleRule) styleRules.push(rule);
+                else if (rule instanceof CSSMediaRule) {
+                    if (window.matchMedia(rule.media.mediaText).matches) walk(rule.cssRules);
+                } else if (rule instanceof CSSSupportsRule) {
+                    if (CSS.supports(rule.conditionText)) walk(rule.cssRules);
+                } else if (rule instanceof CSSImportRule) {
+                    if (rule.styleSheet) walkSheet(rule.styleSheet);
+                } else if (rule.cssRules) walk(rule.cssRules);
+            }
+        };
+        const walkSheet = (sheet) => {
+            let rules;
+            try {
+                rules = sheet.cssRules;
+            } catch (e) {
+                unreadable.push(sheet.href);
+                return;
+            }
+            if (!sheet.disabled) walk(rules);
+        };
+        for (const sheet of document.styleSheets) walkSheet(sheet);
+        return styleRules;
+    };
+
+    // Computed value of ``prop`` on ``element`` were it in state ``pseudo``.
+    const pseudoValue = (element, pseudo, prop) => {
+        const name = kebab(prop);
+        const pseudoRe = new RegExp(pseudo + '(?![\\w-])', 'g');
+        let best = null;
+        allStyleRules().forEach((rule, order) => {
+            const value = rule.style.getPropertyValue(name);
+            if (!value) return;
+            const important = rule.style.getPropertyPriority(name) === 'important';
+            for (const part of splitSelectors(rule.selectorText)) {
+                let matches;
+                try {
+                    matches = element.matches(part.replace(pseudoRe, '').trim() || '*');
+                } catch (e) {
+                    continue;
+                }
+                if (!matches) continue;
+                const candidate = {important, spec: specificity(part), order, value};
+                if (beats(candidate, best)) best = candidate;
+            }
+        });
+        const inline = element.style.getPropertyValue(name);
+        if (inline && (!best || !best.important
+                       || element.style.getPropertyPriority(name) === 'important')) {
+            best = {value: inline};
+        }
+        if (!best) return window.getComputedStyle(element)[prop];
+        // Let the browser resolve keywords and var() on the element itself,
+        // with transitions off so the final value is read at once.
+        const saved = element.getAttribute('style');
+        element.style.setProperty('transition', 'none', 'important');
+        element.style.setProperty(name, best.value, 'important');
+        const value = window.getComputedStyle(element)[prop];
+        if (saved === null) element.removeAttribute('style');
+        else element.setAttribute('style', saved);
+        return value;
+    };
+
+    const result = {};
+    for (const [selector, props] of Object.entries(spec)) {
+        const state = selector.match(/^(.*?)(:hover|:focus|:active)$/);
+        const base = state ? state[1] : selector;
+        const targets = selector === 'window'
+            ? [window]
+            : Array.from(document.querySelectorAll(base));
+        result[selector] = targets.map(target => {
+            const style = target === window ? null : window.getComputedStyle(target);
+            const values = {};
+            for (const prop of props) {
+                let value;
+                if (style && prop in style) {
+                    value = state ? pseudoValue(target, state[2], prop) : style[prop];
+                } else {
+                    value = target[prop];
+                }
+                values[prop] = value === undefined ? null : value;
+            }
+            return values;
+        });
+    }
+    return {values: result, unreadable};
+}
+"""
+
+# Reads ``props`` of one element in its current (really hovered, ...) state.
+READ_ELEMENT_STYLES_JS = """
+(element, props) => {
+    const style = window.getComputedStyle(element);
+    const values = {};
+    for (const prop of props) {
+        const value = prop in style ? style[prop] : element[prop];
+        values[prop] = value === undefined ? null : value;
+    }
+    return values;
+}
+"""
+
+
+def parse_style_spec(spec):
+    """Normalise a spec to ``{selector: [prop, ...]}``."""
+    if isinstance(spec, dict):
+        items = spec.items()
+    else:
+        items = []
+        for line in spec.strip().splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            # Selectors may contain ':' (pseudo-classes); properties never do.
+            selector, sep, props = line.rpartition(":")
+            if not sep:
+                raise ValueError(f"Style spec line needs 'selector: props': {line!r}")
+            items.append((selector.strip(), props))
+    parsed = {}
+    for selector, props in items:
+        if isinstance(props, str):
+            props = props.split(",")
+        parsed[selector] = [prop.strip() for prop in props if prop.strip()]
+    return parsed
+
+
+class StyleSnapshot:
+    """The values collected for a style spec, one dict per matched element."""
+
+    def __init__(self, values):
+        self.values = values
+
+    def all(self, selector, prop):
+        """``prop`` for every element matching ``selector``, in DOM order."""
+        return [element[prop] for element in self.values.get(selector, [])]
+
+    def first(self, selector):
+        """All collected properties of the first match, or None."""
+        elements = self.values.get(selector, [])
+        return elements[0] if elements else None
+
+    def get(self, selector, prop):
+        """``prop`` for the first element matching ``selector``, or None."""
+        values = self.all(selector, prop)
+        return values[0] if values else None
+
+
+def split_state(selector):
+    """``(base selector, pseudo-class)``, or ``(selector, None)``."""
+    for pseudo in DYNAMIC_PSEUDO_CLASSES:
+        if selector.endswith(pseudo):
+            return selector[: -len(pseudo)], pseudo
+    return selector, None
+
+
+def interact_styles(page, selector, props):
+    """Read a ``:hover``/``:focus``/``:active`` selector by really entering the state."""
+    base, pseudo = split_state(selector)
+    elements = page.locator(base)
+    values = []
+    for index in range(elements.count()):
+        element = elements.nth(index)
+        if pseudo == ":focus":
+            element.focus()
+        else:
+            element.hover()
+            if pseudo == ":active":
+                page.mouse.down()
+        try:
+            values.append(element.evaluate(READ_ELEMENT_STYLES_JS, props))
+        finally:
+            if pseudo == ":active":
+                page.mouse.up()
+    # Leave no hover or focus behind for later tests.
+    page.mouse.move(0, 0)
+    page.evaluate("() => document.activeElement && document.activeElement.blur()")
+    return values
+
+
+def collect_styles(page, spec, pseudo_mode="cssom"):
+    """Evaluate ``spec`` on ``page`` in one round trip.
+
+    ``pseudo_mode`` decides how selectors ending in a dynamic pseudo-class
+    are read; see the module docstring.
+    """
+    spec = parse_style_spec(spec)
+    collected = page.evaluate(COLLECT_STYLES_JS, spec)
+    values = collected["values"]
+    if pseudo_mode == "cssom" and not collected["unreadable"]:
+        return StyleSnapshot(values)
+    for selector, props in spec.items():
+        if split_state(selector)[1] is None:
+            continue
+        interacted = interact_styles(page, selector, props)
+        # With unreadable stylesheets there is no stylesheet answer to check.
+        checked = pseudo_mode == "parity" and not collected["unreadable"]
+        if checked and interacted != values[selector]:
+            raise AssertionError(
+                f"Style parity mismatch for {selector!r}: "
+                f"stylesheets gave {values[selector]!r}, interaction gave {interacted!r}"
+            )
+        values[selector] = interacted
+    return StyleSnapshot(values)
@@ -0,0 +1,103 @@
+"""Keep a Playwright trace of a test only when the test fails.
+
+With AUTOGRADER_TRACE=on-failure (the default) each BrowserTestCase class
+records a trace of its context: DOM snapshots around every action, plus
+the page's console messages, uncaught errors and responses in a ring of
+the last ``EVENTS`` entries. Every test is one trace chunk. A passing test
+drops its chunk, so nothing is written; a failing one saves it as
+``<test id>.zip`` under AUTOGRADER_TRACE_DIR and its result gets the path
+and the ring in ``extra_data.trace``. Open a trace with
+``playwright show-trace``.
+
+Traces over AUTOGRADER_TRACE_MAX_MB (10) are deleted again, and once
+AUTOGRADER_TRACE_TOTAL_MB (50) have been saved in a run, later failures
+only keep the ring. test_main.grade starts every run with ``reset``, so
+under the grader daemon the total applies per job. AUTOGRADER_TRACE=off
+records nothing; compare the two with ``run_bench.py --trace-overhead``.
+"""
+
+import os
+from collections import deque
+
+MODE = os.environ.get("AUTOGRADER_TRACE", "on-failure")
+TRACE_DIR = os.environ.get("AUTOGRADER_TRACE_DIR", "/autograder/results/traces")
+MAX_TRACE_BYTES = int(float(os.environ.get("AUTOGRADER_TRACE_MAX_MB", "10")) * 1024 * 1024)
+MAX_TOTAL_BYTES = int(float(os.environ.get("AUTOGRADER_TRACE_TOTAL_MB", "50")) * 1024 * 1024)
+# Console messages, page errors and responses kept per test.
+EVENTS = 50
+
+# Bytes of traces saved so far in this run; see ``reset``.
+_saved_bytes = 0
+
+
+def reset():
+    """Start a new run: the total cap counts from zero again."""
+    global _saved_bytes
+    _saved_bytes = 0
+
+
+class FailureTracer:
+    """Trace chunks of one context, saved for failing tests only."""
+
+    def __init__(self, context, trace_dir=TRACE_DIR):
+        self.context = context
+        self.trace_dir = trace_dir
+        self.events = deque(maxlen=EVENTS)
+        self.recording = False
+        context.tracing.start(snapshots=True, screenshots=False, sources=False)
+
+    @classmethod
+    def start(cls, context):
+        """A tracer for ``context``, or None when tracing is off."""
+        if MODE != "on-failure":
+            return None
+        return cls(context)
+
+    def watch(self, page):
+        """Record ``page``'s console, errors and responses into the ring."""
+        add = self.events.append
+        page.on("console", lambda message: add(f"console.{message.type}: {message.text}"))
+        page.on("pageerror", lambda error: add(f"pageerror: {error}"))
+        page.on("response", lambda response: add(f"{response.status} {response.url}"))
+        page.on("requestfailed", lambda request: add(f"failed {request.url}: {request.failure}"))
+
+    def begin(self):
+        """Start the chunk of the next test."""
+        self.events.clear()
+        self.context.tracing.start_chunk()
+        self.recording = True
+
+    def discard(self):
+        """End the current chunk without writing it."""
+        if self.recording:
+            self.recording = False
+            self.context.tracing.stop_chunk()
+
+    def save(self, name):
+        """End the current chunk, writing it if the caps allow; returns extra_data."""
+        global _saved_bytes
+        if not self.recording:
+            return None
+        self.recording = False
+        record = {"events": list(self.events)}
+        if _saved_bytes >= MAX_TOTAL_BYTES:
+            self.context.tracing.stop_chunk()
+            record["skipped"] = f"over the {MAX_TOTAL_BYTES // (1024 * 1024)} MB total for traces"
+            return record
+        os.makedirs(self.trace_dir, exist_ok=True)
+        path = os.path.join(self.trace_dir, f"{name}.zip")
+        self.context.tracing.stop_chunk(path=path)
+        size = os.path.getsize(path)
+        if size > MAX_TRACE_BYTES:
+            os.remove(path)
+            record["skipped"] = f"trace of {size} bytes is over the per-test cap"
+        else:
+            _saved_bytes += size
+            record["path"] = path
+            record["bytes"] = size
+        return record
+
+    def stop(self):
+        """Stop tracing the context."""
+        self.discard()
+        self.context.tracing.stop()
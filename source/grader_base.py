@@ -0,0 +1,272 @@
+import datetime
+import os
+import unittest
+
+import network
+import preflight
+import timing
+from failure_trace import FailureTracer
+from http_client import HttpClient
+from timeouts import SuiteBudget
+from browser_pool import get_pool
+from computed_styles import collect_styles
+from static_dom import BrowserQueries, ParityQueries, StaticQueries
+
+# Where the student's server listens; run_autograder and test_main.py
+# (--base-url) inject it for servers started on a free port.
+BASE_URL = os.environ.get("AUTOGRADER_BASE_URL", "http://localhost:6543")
+
+# Set AUTOGRADER_REUSE_PAGES=0 to navigate before every test again.
+REUSE_PAGES = os.environ.get("AUTOGRADER_REUSE_PAGES", "1") != "0"
+
+# How ``self.dom`` answers structural queries: "static" parses the served
+# HTML, "browser" asks the live page, "parity" does both and fails on any
+# difference.
+DOM_MODE = os.environ.get("AUTOGRADER_DOM_MODE", "static")
+
+# How ``self.styles`` reads ``:hover``/``:focus``/``:active`` selectors:
+# "cssom" resolves them from the stylesheets, "interact" hovers/focuses for
+# real, "parity" does both and fails on any difference.
+PSEUDO_MODE = os.environ.get("AUTOGRADER_PSEUDO_MODE", "cssom")
+
+# Where the virtual clock of ``VIRTUAL_CLOCK`` suites starts, and how much
+# virtual time each page load of the suite gets before the clock stops. The
+# first load must finish within that much real time.
+VIRTUAL_CLOCK_START = datetime.datetime(2024, 1, 15, 12, 0, 0, tzinfo=datetime.timezone.utc)
+VIRTUAL_CLOCK_LOAD_MS = 60_000
+
+
+def set_base_url(url):
+    """Point every suite at the server listening at ``url``."""
+    global BASE_URL
+    BASE_URL = url.rstrip("/")
+
+
+def mutates_page(func):
+    """Mark a test that changes the page (fills forms, clicks, hovers).
+
+    It always gets a fresh navigation, and the test after it does too.
+    """
+    func.__mutates_page__ = True
+    return func
+
+
+def requires_route(*routes):
+    """Mark a test that also depends on ``routes`` besides the suite's.
+
+    If the preflight probe of one of them failed, only this test fails at
+    once; the suite's other tests still run.
+    """
+
+    def decorate(func):
+        func.__required_routes__ = routes
+        return func
+
+    return decorate
+
+
+def static_check(func):
+    """Mark a test that only uses ``self.dom`` and needs no page load."""
+    func.__static_check__ = True
+    return func
+
+
+class BrowserTestCase(unittest.TestCase):
+    """Base class for suites that drive a page on the shared browser.
+
+    Subclasses set ``ROUTE`` to the path each test starts on and may set
+    ``VIEWPORT`` to pin the page size. The route is loaded once per class
+    and reused by read-only tests; tests decorated with ``mutates_page``, or
+    every test of a class with ``MUTATES_PAGE = True``, get a fresh load.
+
+    Suites that check CSS set ``STYLE_SPEC`` (see computed_styles.py) and
+    read ``self.styles``, which is collected once per page load.
+
+    Structural checks go through ``self.dom`` (see static_dom.py); tests that
+    use nothing else are marked ``static_check`` and skip the browser.
+
+    ``REQUIRED_ROUTES`` lists the routes every test of the suite depends on
+    (default: just ``ROUTE``); if the preflight probe of any of them failed,
+    every test in the suite fails immediately with the probe's message.
+    Routes only some tests use go on those tests with ``requires_route``.
+
+    Page operations time out according to the suite's ``SuiteBudget`` (see
+    timeouts.py); ``TIME_BUDGET_MS`` overrides the default budget. Tests that
+    pass an explicit timeout should use ``self.timeouts.operation_ms()``,
+    with ``at_least`` set to the wait the check needs.
+
+    External requests are answered from the asset cache or aborted (see
+    network.py); ``BLOCK_RESOURCE_TYPES`` (e.g. ``("image", "font")``) also
+    aborts those loads from the student's server for suites that never look
+    at them.
+
+    Tests that only check status codes and JSON bodies request them with
+    ``self.http`` (see http_client.py) rather than through the page.
+
+    Failing tests keep a Playwright trace and the page's last console
+    messages and responses (see failure_trace.py).
+
+    With ``VIRTUAL_CLOCK = True`` the page's Date, setTimeout, setInterval
+    and requestAnimationFrame are fakes installed before any student script
+    runs. Each page load gets ``VIRTUAL_CLOCK_LOAD_MS`` of virtual time,
+    then the clock stops at a fixed point; tests move it with
+    ``self.advance(ms)``, which fires every timer due in that span without
+    sleeping.
+    """
+
+    ROUTE = "/"
+    REQUIRED_ROUTES = None
+    VIEWPORT = None
+    MUTATES_PAGE = False
+    STYLE_SPEC = None
+    TIME_BUDGET_MS = None
+    BLOCK_RESOURCE_TYPES = ()
+    VIRTUAL_CLOCK = False
+
+    @classmethod
+    def setUpClass(cls):
+        """Open a fresh context and page on the shared browser."""
+        cls.context = None
+        cls.tracer = None
+        cls._http = None
+        cls.timeouts = SuiteBudget(cls.TIME_BUDGET_MS)
+        cls._route_failure = preflight.failure_for(cls.required_routes())
+        if cls._route_failure is not None:
+            return
+        options = {}
+        if cls.VIEWPORT is not None:
+            options["viewport"] = cls.VIEWPORT
+        cls.context = get_pool().new_context(**options)
+        network.install(cls.context, cls.ROUTE, cls.BLOCK_RESOURCE_TYPES)
+        if cls.VIRTUAL_CLOCK:
+            cls.context.clock.install(time=VIRTUAL_CLOCK_START)
+            cls._clock_now = VIRTUAL_CLOCK_START
+        cls.page = timing.instrument_page(cls.context.new_page(), BASE_URL)
+        cls.timeouts.apply(cls.page)
+        cls.tracer = FailureTracer.start(cls.context)
+        if cls.tracer is not None:
+            cls.tracer.watch(cls.page)
+        # URL of the currently loaded page while no test has touched it.
+        cls._clean_url = None
+        cls._styles = None
+        cls._static_dom = None
+
+    @classmethod
+    def tearDownClass(cls):
+        """Close the context; the browser itself stays up for other suites."""
+        if cls.tracer is not None:
+            cls.tracer.stop()
+        if cls.context is not None:
+            cls.context.close()
+
+    @classmethod
+    def required_routes(cls):
+        """Routes the suite's tests depend on."""
+        return cls.REQUIRED_ROUTES or (cls.ROUTE,)
+
+    def setUp(self):
+        """Navigate to the suite's route unless a clean load can be reused."""
+        if self._route_failure is not None:
+            self.fail(self._route_failure)
+        failure = preflight.failure_for(preflight.test_routes(self))
+        if failure is not None:
+            self.fail(failure)
+        if self.timeouts.exhausted():
+            self.fail(
+                f"The suite's {self.timeouts.budget_ms} ms time budget was used up "
+                "before this test ran, so it was not run."
+            )
+        self._trace_record = None
+        if self.tracer is not None:
+            self.tracer.begin()
+        with timing.phase("setup"):
+            self._load_route()
+
+    def tearDown(self):
+        """Drop the test's trace chunk, or keep it if the test failed."""
+        if self.tracer is None or not self.tracer.recording:
+            return
+        # Python before 3.11 reports the failure only after tearDown.
+        if getattr(self._outcome, "success", True):
+            self.tracer.discard()
+        else:
+            self._trace_record = self.tracer.save(self.id())
+
+    def failure_extra_data(self):
+        """What the runner adds to a failing test's ``extra_data``."""
+        record = getattr(self, "_trace_record", None)
+        if record is None and self.tracer is not None and self.tracer.recording:
+            record = self.tracer.save(self.id())
+            self._trace_record = record
+        return {"trace": record} if record else {}
+
+    def _load_route(self):
+        if DOM_MODE == "static" and self.is_static_check():
+            return
+        self.timeouts.apply(self.page)
+        target = self.url(self.ROUTE)
+        if self._reuses_page() and type(self)._clean_url == self.page.url == target:
+            return
+        self.page.goto(target)
+        if self.VIRTUAL_CLOCK:
+            # Stop at a time known in advance, not at the page's Date.now(),
+            # which moves on before pause_at reaches the page. Later loads
+            # replay the clock's calls and start paused where it stands.
+            type(self)._clock_now += datetime.timedelta(milliseconds=VIRTUAL_CLOCK_LOAD_MS)
+            self.page.clock.pause_at(type(self)._clock_now)
+        if not self.timeouts.ready:
+            self.timeouts.mark_ready()
+            self.timeouts.apply(self.page)
+        type(self)._clean_url = None if self.mutates_page() else target
+        type(self)._styles = None
+
+    def advance(self, ms):
+        """Run the page's virtual clock ``ms`` forward, firing due timers."""
+        if not self.VIRTUAL_CLOCK:
+            raise RuntimeError(f"{type(self).__name__} does not set VIRTUAL_CLOCK = True")
+        self.page.clock.run_for(ms)
+        type(self)._clock_now += datetime.timedelta(milliseconds=ms)
+
+    @property
+    def http(self):
+        """HttpClient for the suite's tests, sharing cookies with its context on demand."""
+        if type(self)._http is None:
+            type(self)._http = HttpClient(BASE_URL, self.context)
+        return type(self)._http
+
+    @property
+    def styles(self):
+        """StyleSnapshot of ``STYLE_SPEC`` for the current page load."""
+        if type(self)._styles is None:
+            type(self)._styles = collect_styles(self.page, self.STYLE_SPEC, PSEUDO_MODE)
+        return type(self)._styles
+
+    @property
+    def dom(self):
+        """Structural DOM queries for the suite's route."""
+        if DOM_MODE == "browser":
+            return BrowserQueries(self.page)
+        if type(self)._static_dom is None:
+            with timing.phase("static_fetch"):
+                type(self)._static_dom = StaticQueries.fetch(self.url(self.ROUTE))
+        if DOM_MODE == "parity":
+            return ParityQueries(type(self)._static_dom, BrowserQueries(self.page))
+        return type(self)._static_dom
+
+    def is_static_check(self):
+        """True if the current test only needs ``self.dom``."""
+        method = getattr(self, self._testMethodName)
+        return getattr(method, "__static_check__", False)
+
+    def mutates_page(self):
+        """True if the current test may leave the page modified."""
+        method = getattr(self, self._testMethodName)
+        return self.MUTATES_PAGE or getattr(method, "__mutates_page__", False)
+
+    def _reuses_page(self):
+        return REUSE_PAGES and not self.mutates_page()
+
+    @staticmethod
+    def url(path):
+        """Absolute URL of ``path`` on the student's server."""
+        return BASE_URL + path
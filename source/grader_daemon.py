@@ -0,0 +1,293 @@
+"""Keep the grader warm between submissions and take jobs over a Unix socket.
+
+    python3 grader_daemon.py serve &
+    python3 grader_daemon.py submit --base-url http://localhost:7001 \\
+        --submission /autograder/submission --output /autograder/results/results.json
+
+``serve`` pays once for what every run of test_main.py pays again: the
+interpreter, importing Playwright, gradescope_utils and the suites, and
+launching the browser. It then runs ``test_main.grade`` for each job that
+arrives on AUTOGRADER_DAEMON_SOCKET, one at a time, with the browsers left
+running between jobs. A job is the base URL of a server run_autograder has
+already started and checked, the submission's directory and metadata, and
+where to write the results, with ``extra_data.daemon`` saying how warm the
+run was. Jobs always run serially, whatever AUTOGRADER_WORKERS says.
+
+``submit`` is the client run_autograder uses and imports nothing but the
+standard library. The daemon writes the results to a scratch file and
+``submit`` moves them to ``--output``, then exits 0. It exits
+``UNAVAILABLE`` (69) when no daemon answers, the job failed inside the
+daemon, or it did not finish within ``--deadline`` seconds
+(AUTOGRADER_DAEMON_DEADLINE, default 300); run_autograder then runs
+test_main.py itself, as it always did. The daemon stops a job that reaches
+its deadline; one that does not answer ``CANCEL_GRACE`` seconds later is
+killed, so the fallback never grades the server while a job still does.
+
+Nothing starts the daemon by default: a self-hosted grader whose container
+outlives one submission starts ``serve`` once, and until it does
+run_autograder grades with test_main.py.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import shutil
+import signal
+import socket
+import struct
+import sys
+import tempfile
+import time
+import traceback
+
+SOCKET_PATH = os.environ.get("AUTOGRADER_DAEMON_SOCKET", "/tmp/autograder-grader.sock")
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONNECT_TIMEOUT = 1.0
+DEADLINE_SECONDS = float(os.environ.get("AUTOGRADER_DAEMON_DEADLINE", "300"))
+# How long a daemon gets to stop a job past its deadline and answer.
+CANCEL_GRACE = 30.0
+SUBMISSION_DIR = "/autograder/submission"
+METADATA_PATH = "/autograder/submission_metadata.json"
+RESULTS_PATH = "/autograder/results/results.json"
+# sysexits.h EX_UNAVAILABLE: grade without the daemon.
+UNAVAILABLE = 69
+
+
+def _send(sock, message):
+    sock.sendall(json.dumps(message).encode() + b"\n")
+
+
+class JobTimeout(Exception):
+    """Raised in the daemon when a job reaches its deadline."""
+
+
+def _receive(sock):
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = sock.recv(65536)
+        if not chunk:
+            return None
+        data += chunk
+    return json.loads(data)
+
+
+class GraderDaemon:
+    def __init__(self, path=SOCKET_PATH):
+        self.path = path
+        self.started = time.time()
+        self.jobs = 0
+        self.warm_seconds = 0.0
+
+    def warm_up(self):
+        """Import the grader and launch the browser before the first job."""
+        started = time.perf_counter()
+        os.chdir(SOURCE_DIR)
+        sys.path.insert(0, SOURCE_DIR)
+        # Imported here, not at the top, so ``submit`` starts without Playwright.
+        self.test_main = importlib.import_module("test_main")
+        from browser_pool import get_pool
+
+        try:
+            get_pool().start()
+        except Exception:
+            # The first job will try again (and fail like test_main.py would).
+            traceback.print_exc()
+        self.warm_seconds = time.perf_counter() - started
+
+    def stats(self):
+        return {
+            "jobs": self.jobs,
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "warm_up_seconds": round(self.warm_seconds, 3),
+        }
+
+    @staticmethod
+    def _drop_dead_browsers():
+        """Forget a browser that crashed or was killed since the last job."""
+        from browser_pool import get_pool, shutdown_pool
+
+        browser = get_pool().browser
+        if browser is not None and not browser.is_connected():
+            shutdown_pool()
+
+    def handle(self, request):
+        import results_metadata
+        from browser_pool import shutdown_pool
+
+        self.jobs += 1
+        started = time.perf_counter()
+        self._drop_dead_browsers()
+        results_metadata.register("daemon", self.stats)
+        deadline = request.get("deadline")
+
+        def on_alarm(signum, frame):
+            raise JobTimeout(f"The job did not finish within its {deadline:.0f} s deadline")
+
+        previous = signal.signal(signal.SIGALRM, on_alarm)
+        if deadline:
+            # Stops the job even while it waits on the browser or the server.
+            signal.setitimer(signal.ITIMER_REAL, deadline)
+        try:
+            self.test_main.grade(
+                request["base_url"],
+                started=request.get("started_at") or time.time(),
+                keep_browsers=True,
+                submission=request["submission"],
+                metadata=request["metadata"],
+                results_path=request["output"],
+            )
+        except Exception:
+            traceback.print_exc()
+            error = traceback.format_exc()
+            # Start the next job from a fresh browser.
+            try:
+                shutdown_pool()
+            except Exception:
+                traceback.print_exc()
+            return {"ok": False, "error": error}
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+        return {"ok": True, "seconds": round(time.perf_counter() - started, 3)}
+
+    def serve(self):
+        self.warm_up()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.path)
+        os.chmod(self.path, 0o600)
+        server.listen(16)
+
+        def on_term(signum, frame):
+            server.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            sys.exit(0)
+
+        signal.signal(signal.SIGTERM, on_term)
+        signal.signal(signal.SIGINT, on_term)
+        print(f"Grader daemon listening on {self.path}", flush=True)
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    request = _receive(conn)
+                    if request is None:
+                        continue
+                    _send(conn, self.handle(request))
+                except (OSError, ValueError):
+                    # The client went away or sent garbage; wait for the next.
+                    traceback.print_exc()
+
+
+def _kill_peer(sock):
+    """SIGKILL the process at the other end of ``sock`` and wait until it is gone."""
+    try:
+        credentials = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        pid = struct.unpack("3i", credentials)[0]
+        os.kill(pid, signal.SIGKILL)
+    except OSError:
+        return
+    for _ in range(50):
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                # Field 3 is the state; a zombie no longer runs anything.
+                if f.read().rsplit(")", 1)[1].split()[0] == "Z":
+                    return
+        except OSError:
+            return
+        time.sleep(0.1)
+
+
+def submit(
+    base_url,
+    submission=SUBMISSION_DIR,
+    output=RESULTS_PATH,
+    metadata=METADATA_PATH,
+    path=SOCKET_PATH,
+    deadline=DEADLINE_SECONDS,
+):
+    """Have the daemon grade the server at ``base_url``; returns an exit status."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(path)
+    except OSError:
+        return UNAVAILABLE
+    # Results only reach ``output`` from here, so a job that answers after
+    # the deadline cannot overwrite the results of the fallback run.
+    fd, scratch = tempfile.mkstemp(prefix="daemon-results-", suffix=".json")
+    os.close(fd)
+    started_at = os.environ.get("AUTOGRADER_STARTED_AT")
+    job = {
+        "base_url": base_url,
+        "submission": os.path.abspath(submission),
+        "metadata": os.path.abspath(metadata),
+        "output": scratch,
+        "started_at": started_at and float(started_at),
+        "deadline": deadline,
+    }
+    with sock:
+        # The daemon stops the job at the deadline; this is for one that
+        # cannot even do that.
+        sock.settimeout(deadline + CANCEL_GRACE)
+        try:
+            _send(sock, job)
+            reply = _receive(sock)
+        except socket.timeout:
+            print(
+                f"The grader daemon did not stop its job {CANCEL_GRACE:.0f} s after "
+                f"the {deadline:.0f} s deadline; killing it",
+                file=sys.stderr,
+            )
+            _kill_peer(sock)
+            reply = None
+        except OSError:
+            reply = None
+    if reply is None or not reply.get("ok"):
+        if reply is not None:
+            print(reply.get("error", ""), file=sys.stderr)
+        try:
+            os.remove(scratch)
+        except OSError:
+            pass
+        return UNAVAILABLE
+    shutil.move(scratch, output)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm grader daemon")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="Unix socket path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", help="run the daemon")
+    client = commands.add_parser("submit", help="grade one running server")
+    client.add_argument("--base-url", required=True)
+    client.add_argument("--submission", default=SUBMISSION_DIR, help="the submission's files")
+    client.add_argument("--metadata", default=METADATA_PATH, help="submission_metadata.json")
+    client.add_argument("--output", default=RESULTS_PATH, help="where to write results.json")
+    client.add_argument(
+        "--deadline",
+        type=float,
+        default=DEADLINE_SECONDS,
+        help="seconds to wait for the results before giving up (default %(default)s)",
+    )
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        GraderDaemon(args.socket).serve()
+        return 0
+    return submit(
+        args.base_url,
+        args.submission,
+        args.output,
+        args.metadata,
+        args.socket,
+        args.deadline,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
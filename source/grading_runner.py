@@ -0,0 +1,83 @@
+"""JSONTestRunner with per-test timing and the test's suite in ``extra_data``.
+
+Failing tests also get what the student's server printed while they ran
+(see log_capture.py).
+"""
+
+import re
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from gradescope_utils.autograder_utils.json_test_runner import (
+    JSONTestResult,
+    JSONTestRunner,
+)
+
+import log_capture
+import timeouts
+import timing
+
+_ERROR_HOLDER_RE = re.compile(r"\((\S+)\.[^.\s]+\)$")
+
+
+def suite_of(test):
+    """Module name of ``test``; setUpClass errors only carry a description."""
+    if hasattr(test, "_testMethodName"):
+        return type(test).__module__
+    match = _ERROR_HOLDER_RE.search(test.description)
+    return match.group(1) if match else None
+
+
+class GradingTestResult(JSONTestResult):
+    _log_mark = None
+
+    def startTest(self, test):
+        super().startTest(test)
+        timing.start_test()
+        self._log_mark = log_capture.mark()
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        timing.stop_test()
+
+    def buildResult(self, test, err=None):
+        result = super().buildResult(test, err)
+        if err is not None and not self.getHideErrors(test):
+            server_log = log_capture.since(self._log_mark)
+            if server_log:
+                output = result.get("output", "") + "\nYour server printed during this test:\n"
+                result["output"] = output + server_log
+        result.setdefault("extra_data", {})["suite"] = suite_of(test)
+        # Measurements a test wants kept with its result (e.g. the load suite).
+        result["extra_data"].update(getattr(test, "extra_data", None) or {})
+        if err is not None and hasattr(test, "failure_extra_data"):
+            result["extra_data"].update(test.failure_extra_data())
+        timer = timing.current()
+        if timer is not None:
+            result.setdefault("extra_data", {})["timing"] = timer.summary()
+        budget = getattr(type(test), "timeouts", None)
+        if budget is not None:
+            result.setdefault("extra_data", {})["time_budget"] = budget.summary()
+        return result
+
+    def processResult(self, test, err=None):
+        # setUpClass/tearDownClass errors arrive as an _ErrorHolder, which
+        # has no test method for the decorator lookups to inspect.
+        if not hasattr(test, "_testMethodName"):
+            self.results.append(
+                {
+                    "name": test.description,
+                    "score": 0.0,
+                    "max_score": 0.0,
+                    "status": "failed",
+                    "output": "{0}{1}\n".format(self.failure_prefix, err[1]),
+                    "extra_data": {"suite": suite_of(test)},
+                }
+            )
+            return
+        if err is not None and issubclass(err[0], PlaywrightTimeoutError):
+            err = (err[0], timeouts.describe_timeout(err[1]), err[2])
+        super().processResult(test, err)
+
+
+class GradingTestRunner(JSONTestRunner):
+    resultclass = GradingTestResult
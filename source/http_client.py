@@ -0,0 +1,154 @@
+"""Direct HTTP requests to the student's server, without the browser.
+
+``self.page.request`` sends every request through the Playwright driver.
+Tests that only check status codes and JSON bodies use ``self.http``
+instead: an ``HttpClient`` per TestCase class whose connections come from
+one keep-alive pool shared by the whole run.
+
+Each client has its own cookie jar. With ``browser_cookies=True`` a
+request first takes the cookies of the class's browser context (e.g. the
+session the form submission started) and hands any cookies the response
+sets back to the context, so the browser and the client stay one session.
+Path, expiry, Secure, HttpOnly and SameSite go along both ways; a cookie
+a response deletes (Max-Age=0) stays in the context::
+
+    self.page.locator("input[type='submit']").click()
+    response = self.http.get("/stock/1", browser_cookies=True)
+
+``get_all`` sends several GETs concurrently over the pool. A cookie jar is
+not safe to share between threads, so each worker thread sends through a
+session of its own, starting from a copy of the client's cookies; the
+cookies the responses set are merged back into the client's jar (and,
+with ``browser_cookies=True``, into the context) once all have answered.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import timing
+
+POOL_SIZE = 16
+TIMEOUT_SECONDS = 30
+
+# One connection pool for every client; mounted on each client's session.
+_adapter = None
+
+
+def shared_adapter():
+    """The run-wide keep-alive adapter, created on first use."""
+    global _adapter
+    if _adapter is None:
+        _adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+    return _adapter
+
+
+class HttpClient:
+    """Requests against ``base_url`` sharing cookies with ``context`` on demand."""
+
+    def __init__(self, base_url, context=None):
+        self.base_url = base_url
+        self.context = context
+        self.session = self._new_session()
+
+    @staticmethod
+    def _new_session():
+        session = requests.Session()
+        session.mount("http://", shared_adapter())
+        session.mount("https://", shared_adapter())
+        return session
+
+    def url(self, path):
+        return self.base_url + path
+
+    def _take_browser_cookies(self):
+        for cookie in self.context.cookies(self.base_url):
+            # http.cookiejar never matches a host-only cookie for a dotless
+            # host such as localhost; the client only talks to one server,
+            # so such cookies go in without a domain.
+            domain = cookie["domain"] if cookie["domain"].startswith(".") else ""
+            rest = {"HttpOnly": None} if cookie.get("httpOnly") else {}
+            if cookie.get("sameSite"):
+                rest["SameSite"] = cookie["sameSite"]
+            expires = cookie.get("expires", -1)
+            self.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=domain,
+                path=cookie["path"],
+                # Playwright marks session cookies with -1.
+                expires=int(expires) if expires >= 0 else None,
+                secure=cookie.get("secure", False),
+                rest=rest,
+            )
+
+    def _browser_cookie(self, cookie):
+        """``cookie`` from a requests jar as an entry for ``add_cookies``."""
+        # A host-only cookie is stored under the effective host name
+        # (localhost.local for localhost); the context wants the real one.
+        domain = cookie.domain if cookie.domain_specified else urlsplit(self.base_url).hostname
+        entry = {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": domain,
+            "path": cookie.path or "/",
+            "secure": bool(cookie.secure),
+            "httpOnly": cookie.has_nonstandard_attr("HttpOnly"),
+        }
+        if cookie.expires is not None:
+            entry["expires"] = cookie.expires
+        same_site = (cookie.get_nonstandard_attr("SameSite") or "").capitalize()
+        if same_site in ("Strict", "Lax", "None"):
+            entry["sameSite"] = same_site
+        return entry
+
+    def _give_browser_cookies(self, response):
+        cookies = [self._browser_cookie(cookie) for cookie in response.cookies]
+        if cookies:
+            self.context.add_cookies(cookies)
+
+    def request(self, method, path, browser_cookies=False, **kwargs):
+        """Send one request; returns a ``requests.Response``."""
+        kwargs.setdefault("timeout", TIMEOUT_SECONDS)
+        share = browser_cookies and self.context is not None
+        if share:
+            self._take_browser_cookies()
+        with timing.phase("http"):
+            response = self.session.request(method, self.url(path), **kwargs)
+        if share:
+            self._give_browser_cookies(response)
+        return response
+
+    def get(self, path, browser_cookies=False, **kwargs):
+        return self.request("GET", path, browser_cookies, **kwargs)
+
+    def post(self, path, browser_cookies=False, **kwargs):
+        return self.request("POST", path, browser_cookies, **kwargs)
+
+    def get_all(self, paths, browser_cookies=False, **kwargs):
+        """GET every path concurrently; responses in the order of ``paths``."""
+        paths = list(paths)
+        share = browser_cookies and self.context is not None
+        if share:
+            # Once for the batch rather than once per request.
+            self._take_browser_cookies()
+        kwargs.setdefault("timeout", TIMEOUT_SECONDS)
+        cookies = self.session.cookies.copy()
+        workers = threading.local()
+
+        def get(path):
+            if not hasattr(workers, "session"):
+                workers.session = self._new_session()
+                workers.session.cookies = cookies.copy()
+            return workers.session.get(self.url(path), **kwargs)
+
+        with timing.phase("http"), ThreadPoolExecutor(min(len(paths), POOL_SIZE) or 1) as pool:
+            responses = list(pool.map(get, paths))
+        for response in responses:
+            self.session.cookies.update(response.cookies)
+            if share:
+                self._give_browser_cookies(response)
+        return responses
@@ -0,0 +1,219 @@
+"""Regrade only the suites whose inputs changed since the last submission.
+
+A suite is one test module (test_clock_css.py, test_puppy_html.py, ...).
+Its inputs are:
+
+- its own source, every other grader module (grader_base.py, static_dom.py,
+  timeouts.py, ...; not the other suites) and the grading settings, as in
+  result_cache.py;
+- the routes its tests load (``preflight.required_routes``) and the local
+  scripts, stylesheets and images those pages reference, fingerprinted by
+  the hash of what the student's server returns for each;
+- the submission's Python files, which every suite depends on because
+  they decide what the server does with form posts and API calls.
+
+Each run stores these fingerprints and every suite's test results in
+``extra_data.incremental.manifest``. Gradescope hands earlier results back
+in submission_metadata.json, so the next run reruns only the suites whose
+fingerprints differ and copies the others' results from the manifest.
+Suites whose stored results have failures a rerun might not repeat (see
+``result_cache.unrepeatable_failures``: a route of the suite that answered
+with an error status is not one of them) always rerun. The decision for
+every suite is in ``extra_data.incremental.decisions``.
+AUTOGRADER_INCREMENTAL=0 reruns everything.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import unittest
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+
+import preflight
+from parallel_runner import iter_tests
+from result_cache import grader_files, grading_settings, submission_files, unrepeatable_failures
+from static_dom import parse_html, select
+
+ENABLED = os.environ.get("AUTOGRADER_INCREMENTAL", "1") != "0"
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Elements whose targets a page loads, and the attribute naming them.
+ASSET_SELECTORS = (("script[src]", "src"), ("link[href]", "href"), ("img[src]", "src"))
+
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_sha(path):
+    with open(path, "rb") as f:
+        return _sha(f.read())
+
+
+def previous_manifest(path):
+    """Manifest of the latest earlier submission in the metadata at ``path``."""
+    try:
+        with open(path) as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return None
+    for submission in reversed(metadata.get("previous_submissions") or []):
+        extra = (submission.get("results") or {}).get("extra_data") or {}
+        manifest = (extra.get("incremental") or {}).get("manifest")
+        if manifest:
+            return manifest
+    return None
+
+
+def server_fingerprint(submission):
+    digest = hashlib.sha256()
+    for path in sorted(submission_files(submission)):
+        if path.endswith(".py"):
+            digest.update(os.path.relpath(path, submission).encode() + b"\0")
+            digest.update(bytes.fromhex(_file_sha(path)))
+    return digest.hexdigest()
+
+
+def grader_fingerprint(module, exclude=()):
+    """Hash of ``module``, the grader modules it shares and the settings.
+
+    ``exclude`` names the submission's own files, which run_autograder
+    copies over the source directory.
+    """
+    source = getattr(sys.modules.get(module), "__file__", None)
+    shared = [
+        path
+        for path in sorted(grader_files(SOURCE_DIR, exclude))
+        if not os.path.basename(path).startswith("test_")
+    ]
+    paths = shared + ([source] if source else [])
+    return _sha(("".join(_file_sha(path) for path in paths) + grading_settings()).encode())
+
+
+class _Fetcher:
+    """GETs against the student's server, each path fetched at most once."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.bodies = {}
+
+    def get(self, path):
+        if path not in self.bodies:
+            try:
+                with urlopen(self.base_url + path, timeout=10) as response:
+                    self.bodies[path] = (response.status, response.read())
+            except HTTPError as error:
+                self.bodies[path] = (error.code, b"")
+            except OSError:
+                self.bodies[path] = (None, b"")
+        return self.bodies[path]
+
+    def fingerprint(self, path):
+        status, body = self.get(path)
+        return f"{status}:{_sha(body)}"
+
+    def assets(self, path):
+        """Local paths the page at ``path`` references."""
+        status, body = self.get(path)
+        if status != 200:
+            return set()
+        document = parse_html(body.decode("utf-8", errors="replace"))
+        found = set()
+        for selector, attr in ASSET_SELECTORS:
+            for element in select(document, selector):
+                parts = urlsplit(element.attrs[attr])
+                if parts.scheme or parts.netloc or not parts.path.startswith("/"):
+                    continue
+                found.add(parts.path)
+        return found
+
+
+class Plan:
+    """Which suites of ``tests`` to rerun against the server at ``base_url``."""
+
+    def __init__(self, tests, base_url, submission, previous=None):
+        self.modules = {}
+        self.routes = {}
+        for test in tests:
+            module = type(test).__module__
+            self.modules.setdefault(module, set()).add(type(test))
+            self.routes.setdefault(module, set()).update(preflight.required_routes([test]))
+        fetcher = _Fetcher(base_url)
+        server = server_fingerprint(submission)
+        own_files = [os.path.relpath(path, submission) for path in submission_files(submission)]
+        self.manifest = {"server": server, "suites": {}}
+        self.decisions = {}
+        for module in self.modules:
+            paths = set(self.routes[module])
+            for route in self.routes[module]:
+                paths.update(fetcher.assets(route))
+            entry = {
+                "grader": grader_fingerprint(module, own_files),
+                "urls": {path: fetcher.fingerprint(path) for path in sorted(paths)},
+            }
+            self.manifest["suites"][module] = entry
+            self.decisions[module] = self._decide(previous, server, module, entry)
+
+    @staticmethod
+    def _decide(previous, server, module, entry):
+        if not ENABLED:
+            return {"action": "rerun", "reason": "incremental regrading is off"}
+        if previous is None:
+            return {"action": "rerun", "reason": "no earlier results"}
+        old = previous.get("suites", {}).get(module)
+        if old is None or "tests" not in old:
+            return {"action": "rerun", "reason": "suite not in earlier results"}
+        if old.get("grader") != entry["grader"]:
+            return {"action": "rerun", "reason": "tests changed"}
+        unrepeatable = old.get("unrepeatable") or unrepeatable_failures({"tests": old["tests"]})
+        if unrepeatable:
+            reason = "earlier failures may not repeat: " + "; ".join(unrepeatable)
+            return {"action": "rerun", "reason": reason}
+        if previous.get("server") != server:
+            return {"action": "rerun", "reason": "server code changed"}
+        changed = sorted(
+            path
+            for path in set(old.get("urls", {})) | set(entry["urls"])
+            if old.get("urls", {}).get(path) != entry["urls"].get(path)
+        )
+        if changed:
+            return {"action": "rerun", "reason": "changed: " + ", ".join(changed)}
+        return {"action": "reuse", "reason": "unchanged", "tests": old["tests"]}
+
+    def rerun_suite(self, suite):
+        """``suite`` without the tests of suites whose results are reused."""
+        return unittest.TestSuite(
+            test
+            for test in iter_tests(suite)
+            if self.decisions[type(test).__module__]["action"] == "rerun"
+        )
+
+    def merge(self, results):
+        """Put the reused results back in discovery order and record the plan."""
+        fresh = {}
+        for test in results["tests"]:
+            module = test.get("extra_data", {}).get("suite")
+            fresh.setdefault(module, []).append(test)
+        tests = []
+        for module, decision in self.decisions.items():
+            if decision["action"] == "reuse":
+                suite_tests = decision.pop("tests")
+            else:
+                suite_tests = fresh.pop(module, [])
+                unrepeatable = unrepeatable_failures(results, suite_tests, self.routes[module])
+                if unrepeatable:
+                    self.manifest["suites"][module]["unrepeatable"] = unrepeatable
+            self.manifest["suites"][module]["tests"] = suite_tests
+            tests.extend(suite_tests)
+        # Anything not attributable to a suite (should not happen) stays.
+        for leftover in fresh.values():
+            tests.extend(leftover)
+        results["tests"] = tests
+        results["score"] = sum(test.get("score", 0.0) for test in tests)
+        results.setdefault("extra_data", {})["incremental"] = {
+            "decisions": self.decisions,
+            "manifest": self.manifest,
+        }
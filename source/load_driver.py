@@ -0,0 +1,91 @@
+"""Drive HTTP endpoints with concurrent keep-alive clients and measure them.
+
+``run_load`` starts ``clients`` threads. Each keeps one HTTP/1.1 connection
+open and sends ``requests_per_client`` GETs, cycling through the paths
+(starting at a different one per client, so every endpoint is under
+concurrent load at once). A connection error or a status of 400 or more
+counts as an error; after a connection error the client reconnects.
+"""
+
+import http.client
+import math
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of ``values`` (sorted), or None if empty."""
+    if not values:
+        return None
+    rank = max(1, math.ceil(fraction * len(values)))
+    return values[rank - 1]
+
+
+def _client(host, port, paths, offset, count, timeout, samples, barrier):
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    barrier.wait()
+    for i in range(count):
+        path = paths[(offset + i) % len(paths)]
+        started = time.perf_counter()
+        try:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            ok = False
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        samples.append((path, time.perf_counter() - started, ok))
+    connection.close()
+
+
+def run_load(base_url, paths, clients=8, requests_per_client=60, timeout=10.0, group=None):
+    """Load ``paths`` on ``base_url``; returns stats per endpoint and overall.
+
+    ``group`` maps a path to the endpoint it is reported under (e.g. every
+    /stock/{n} under one name); by default each path is its own endpoint.
+    """
+    parts = urlsplit(base_url)
+    samples = []
+    barrier = threading.Barrier(clients + 1)
+    threads = [
+        threading.Thread(
+            target=_client,
+            args=(parts.hostname, parts.port, paths, n, requests_per_client, timeout, samples, barrier),
+            daemon=True,
+        )
+        for n in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    group = group or (lambda path: path)
+    by_endpoint = {}
+    for path, seconds, ok in samples:
+        by_endpoint.setdefault(group(path), []).append((seconds, ok))
+    by_endpoint["overall"] = [(seconds, ok) for _, seconds, ok in samples]
+    stats = {}
+    for endpoint, results in by_endpoint.items():
+        latencies = sorted(seconds * 1000 for seconds, _ in results)
+        errors = sum(not ok for _, ok in results)
+        stats[endpoint] = {
+            "requests": len(results),
+            "errors": errors,
+            "error_rate": round(errors / len(results), 4),
+            "throughput_rps": round(len(results) / wall, 1) if wall else None,
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+        }
+    return {
+        "clients": clients,
+        "requests_per_client": requests_per_client,
+        "wall_seconds": round(wall, 3),
+        "endpoints": stats,
+    }
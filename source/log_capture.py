@@ -0,0 +1,246 @@
+"""Capture the student server's output into a log of bounded size.
+
+    python3 app.py 2>&1 | python3 log_capture.py capture fastapi.log
+
+The log keeps the first AUTOGRADER_LOG_HEAD_KB (64) and the last
+AUTOGRADER_LOG_TAIL_KB (192) kilobytes of what the server printed. Whatever
+falls between them is replaced by one marker line giving how many bytes
+were left out, so a server stuck printing a traceback in a loop can neither
+fill the disk nor make results.json huge. The tail is kept in memory and
+written out at most every ``FLUSH_SECONDS``, and as soon as the server
+goes quiet.
+
+server_supervisor.py (``--log``) and batch_grade.py capture the server's
+output the same way, in process.
+
+Positions in the log are absolute byte offsets into everything the server
+printed; ``offset`` and ``read_since`` work them out from the marker. The
+runner notes the offset when a test starts and adds what the server printed
+during a failing test to that test's output (``mark``, ``since``).
+
+    python3 log_capture.py failure-results fastapi.log --output results.json
+
+writes the sanity-check failure results with the log as a properly escaped
+JSON string.
+"""
+
+import argparse
+import json
+import os
+import re
+import select
+import sys
+import threading
+import time
+
+HEAD_BYTES = int(float(os.environ.get("AUTOGRADER_LOG_HEAD_KB", "64")) * 1024)
+TAIL_BYTES = int(float(os.environ.get("AUTOGRADER_LOG_TAIL_KB", "192")) * 1024)
+# Most of a single test's log that goes into its output.
+SLICE_BYTES = int(float(os.environ.get("AUTOGRADER_LOG_SLICE_KB", "4")) * 1024)
+FLUSH_SECONDS = 0.2
+CHUNK_BYTES = 65536
+
+MARKER = b"\n[... %d bytes of server output left out ...]\n"
+_MARKER_RE = re.compile(rb"\n\[\.\.\. (\d+) bytes of server output left out \.\.\.\]\n")
+
+SANITY_CHECK_NAME = (
+    "You did not pass the sanity check, your server failed to start. Here are the logs:"
+)
+
+# The log the runner slices for failing tests; set by ``watch``.
+_watched = None
+
+
+class LogCapture:
+    """Writes a stream to ``path``, keeping its head and tail."""
+
+    def __init__(self, path, head_bytes=HEAD_BYTES, tail_bytes=TAIL_BYTES):
+        self.path = path
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.total = 0
+        self.tail = bytearray()
+        self.file = open(path, "wb")
+        # A supervisor that restarts the server follows one stream per run.
+        self.lock = threading.Lock()
+        self._last_flush = 0.0
+        self._dirty = False
+
+    def write(self, data):
+        room = self.head_bytes - self.total
+        if room > 0:
+            self.file.write(data[:room])
+            self.file.flush()
+        self.total += len(data)
+        if room < len(data):
+            self.tail += data[max(room, 0):]
+            # Not [-tail_bytes:], which keeps everything for a zero tail.
+            del self.tail[: max(len(self.tail) - self.tail_bytes, 0)]
+            self._dirty = True
+            if time.monotonic() - self._last_flush >= FLUSH_SECONDS:
+                self.flush()
+
+    def flush(self):
+        """Rewrite everything after the head with the current tail."""
+        self._last_flush = time.monotonic()
+        self._dirty = False
+        if self.total <= self.head_bytes:
+            return
+        omitted = self.total - self.head_bytes - len(self.tail)
+        self.file.seek(self.head_bytes)
+        self.file.truncate()
+        if omitted:
+            self.file.write(MARKER % omitted)
+        self.file.write(self.tail)
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def follow(self, stream, close=True):
+        """Copy ``stream`` (binary) into the log until it ends."""
+        try:
+            while True:
+                # Write out a pending tail once the server goes quiet.
+                if self._dirty and not select.select([stream], [], [], FLUSH_SECONDS)[0]:
+                    with self.lock:
+                        self.flush()
+                    continue
+                data = stream.read1(CHUNK_BYTES)
+                if not data:
+                    break
+                with self.lock:
+                    self.write(data)
+        finally:
+            with self.lock:
+                if close:
+                    self.close()
+                else:
+                    self.flush()
+
+    def follow_in_background(self, stream, close=True):
+        """``follow`` on a daemon thread; returns the thread."""
+        thread = threading.Thread(target=self.follow, args=(stream, close), daemon=True)
+        thread.start()
+        return thread
+
+
+def _load(path, head_bytes=HEAD_BYTES):
+    """(head, tail start offset, tail) of the log at ``path``."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return b"", 0, b""
+    match = _MARKER_RE.match(data, head_bytes)
+    if len(data) <= head_bytes or match is None:
+        return data, len(data), b""
+    omitted = int(match.group(1))
+    return data[:head_bytes], head_bytes + omitted, data[match.end():]
+
+
+def offset(path):
+    """How many bytes the server has printed to ``path`` so far."""
+    _, tail_start, tail = _load(path)
+    return tail_start + len(tail)
+
+
+def read_since(path, start, limit=SLICE_BYTES):
+    """Text the server printed from offset ``start`` on, at most its last ``limit`` bytes."""
+    head, tail_start, tail = _load(path)
+    end = tail_start + len(tail)
+    if end <= start:
+        return ""
+    prefix = ""
+    if start < len(head):
+        data = head[start:]
+        if tail_start > len(head):
+            data += MARKER % (tail_start - len(head)) + tail
+    elif start < tail_start:
+        prefix = f"[... {tail_start - start} bytes of server output left out ...]\n"
+        data = tail
+    else:
+        data = tail[start - tail_start:]
+    if len(data) > limit:
+        prefix = f"[... {len(data) - limit} earlier bytes left out ...]\n"
+        data = data[-limit:]
+    return prefix + data.decode("utf-8", errors="replace")
+
+
+def read_log(path):
+    """The whole (bounded) log as text; empty if there is none."""
+    try:
+        with open(path, "rb") as f:
+            return f.read().decode("utf-8", errors="replace")
+    except OSError:
+        return ""
+
+
+def watch(path):
+    """Make ``since`` read the server log at ``path``."""
+    global _watched
+    _watched = path
+
+
+def mark():
+    """Offset to remember when a test starts, or None if no log is watched."""
+    if _watched is None:
+        return None
+    return offset(_watched)
+
+
+def since(start):
+    """What the server printed since ``start`` (from ``mark``)."""
+    if _watched is None or start is None:
+        return ""
+    return read_since(_watched, start)
+
+
+def failure_results(log_text, server_metrics, seconds):
+    """Results for a server that never came up."""
+    return {
+        "tests": [
+            {
+                "name": SANITY_CHECK_NAME,
+                "score": 0,
+                "max_score": 0,
+                "status": "failed",
+                "output": log_text,
+            }
+        ],
+        "leaderboard": [],
+        "visibility": "visible",
+        "execution_time": format(seconds, "0.2f"),
+        "score": 0,
+        "extra_data": {"server": server_metrics},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bounded server log capture")
+    commands = parser.add_subparsers(dest="command", required=True)
+    capture = commands.add_parser("capture", help="copy stdin into a bounded log")
+    capture.add_argument("log")
+    failure = commands.add_parser("failure-results", help="write sanity-check failure results")
+    failure.add_argument("log")
+    failure.add_argument("--output", required=True)
+    failure.add_argument("--metrics", help="JSON file from wait_for_server.py --metrics")
+    failure.add_argument("--seconds", type=float, default=0.0, help="execution time")
+    args = parser.parse_args()
+
+    if args.command == "capture":
+        LogCapture(args.log).follow(sys.stdin.buffer)
+        return 0
+    metrics = {}
+    if args.metrics and os.path.exists(args.metrics):
+        with open(args.metrics) as f:
+            metrics = json.load(f)
+    results = failure_results(read_log(args.log), metrics, args.seconds)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Offline stand-in for the stock data API students call from their servers.
+
+    python3 mock_stock_api.py --port 8100 [--latency-ms 50]
+
+Serves the recorded responses in stock_fixtures.json in the shape of the
+Financial Modeling Prep API the assignment uses, so grading does not depend
+on a third-party service:
+
+- ``/api/v3/profile/AAPL`` (comma-separated symbols allowed)
+- ``/api/v3/quote/AAPL``
+- ``/stable/profile?symbol=AAPL`` and ``/stable/quote?symbol=AAPL``
+
+Unknown symbols get ``[]``, as from the real API. The ``apikey`` parameter
+is accepted and ignored. run_autograder starts this next to the student's
+server and exports its address as STOCK_API_URL (see the README).
+
+``/stats`` returns how many API requests have been answered so far; the
+load suite (test_stock_load.py) compares it before and after the load to
+see whether a server caches its lookups.
+
+Responses are rendered once per request path and then served from memory;
+``--latency-ms`` (or AUTOGRADER_STOCK_API_LATENCY_MS) delays every response
+to test how submissions cope with a slow upstream.
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stock_fixtures.json")
+LATENCY_MS = float(os.environ.get("AUTOGRADER_STOCK_API_LATENCY_MS", "0"))
+
+with open(FIXTURES_PATH) as f:
+    FIXTURES = json.load(f)
+
+
+def _quote(profile):
+    return {
+        "symbol": profile["symbol"],
+        "name": profile["companyName"],
+        "price": profile["price"],
+        "exchange": profile["exchangeShortName"],
+    }
+
+
+@lru_cache(maxsize=None)
+def render(kind, symbols):
+    """Encoded response body for ``kind`` ("profile" or "quote") of ``symbols``."""
+    profiles = [FIXTURES[s] for s in symbols if s in FIXTURES]
+    if kind == "quote":
+        profiles = [_quote(profile) for profile in profiles]
+    return json.dumps(profiles).encode()
+
+
+def parse_request(path):
+    """(kind, symbols) for an API path, or None if it is not one."""
+    parts = urlsplit(path)
+    segments = [s for s in parts.path.split("/") if s]
+    if len(segments) == 4 and segments[:2] == ["api", "v3"]:
+        kind, symbols = segments[2], segments[3]
+    elif len(segments) == 2 and segments[0] == "stable":
+        kind = segments[1]
+        symbols = parse_qs(parts.query).get("symbol", [""])[0]
+    else:
+        return None
+    if kind not in ("profile", "quote"):
+        return None
+    return kind, tuple(s.strip().upper() for s in symbols.split(",") if s.strip())
+
+
+# API requests answered so far, across all handler threads.
+_served = 0
+_served_lock = threading.Lock()
+
+
+class StockAPIHandler(BaseHTTPRequestHandler):
+    latency = LATENCY_MS / 1000
+
+    def do_GET(self):
+        global _served
+        if self.path == "/health":
+            self._send(200, b'{"status": "ok"}')
+            return
+        if self.path == "/stats":
+            self._send(200, json.dumps({"requests": _served}).encode())
+            return
+        request = parse_request(self.path)
+        if request is None:
+            self._send(404, b'{"Error Message": "Unknown endpoint"}')
+            return
+        with _served_lock:
+            _served += 1
+        if self.latency:
+            time.sleep(self.latency)
+        self._send(200, render(*request))
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start(port=0, latency_ms=None, host="127.0.0.1"):
+    """Serve the mock API from a daemon thread; returns the server.
+
+    ``server.server_address`` gives the bound port; call ``shutdown()``
+    when done.
+    """
+    # Batch grading runs this in-process; keep the access log off its stderr.
+    attrs = {"log_message": lambda self, *args: None}
+    if latency_ms is not None:
+        attrs["latency"] = latency_ms / 1000
+    handler = type("Handler", (StockAPIHandler,), attrs)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def url(server):
+    """Base URL of a server returned by ``start``."""
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded stock API responses")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--latency-ms", type=float, default=LATENCY_MS)
+    args = parser.parse_args()
+
+    StockAPIHandler.latency = args.latency_ms / 1000
+    server = ThreadingHTTPServer((args.host, args.port), StockAPIHandler)
+    server.daemon_threads = True
+    print(f"Mock stock API on http://{args.host}:{args.port}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
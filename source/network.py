@@ -0,0 +1,173 @@
+"""Route the browser's requests so pages never wait on the internet.
+
+Every BrowserContext the suites open goes through ``install``:
+
+- requests to the student's server (any loopback host) go through, unless
+  their resource type is in the suite's ``BLOCK_RESOURCE_TYPES``;
+- external requests for assets in the on-disk cache (fonts, CSS frameworks,
+  scripts from CDNs) are answered from it;
+- every other external request is aborted at once instead of hanging until
+  the navigation times out on an offline grader.
+
+Counts of blocked and cached requests per suite route end up in
+``extra_data.network``. Set AUTOGRADER_INTERCEPT_NETWORK=0 to let every
+request through untouched.
+
+The cache lives in AUTOGRADER_ASSET_CACHE (default ``asset_cache/`` next to
+this file) and is filled while building the image, with network access:
+
+    python3 network.py add https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+
+INTERCEPT = os.environ.get("AUTOGRADER_INTERCEPT_NETWORK", "1") != "0"
+CACHE_DIR = os.environ.get(
+    "AUTOGRADER_ASSET_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "asset_cache"),
+)
+INDEX_NAME = "index.json"
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+# suite route -> {"blocked": n, "cached": n, "aborted_external": n}
+_stats = {}
+
+
+class AssetCache:
+    """URL -> (body, content type), loaded from ``CACHE_DIR`` on first use."""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        self._index = None
+        self._bodies = {}
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(os.path.join(self.directory, INDEX_NAME)) as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def lookup(self, url):
+        """(body, content type) for ``url``, ignoring its query if need be."""
+        index = self._load_index()
+        entry = index.get(url) or index.get(url.split("?", 1)[0])
+        if entry is None:
+            return None
+        if entry["file"] not in self._bodies:
+            with open(os.path.join(self.directory, entry["file"]), "rb") as f:
+                self._bodies[entry["file"]] = f.read()
+        return self._bodies[entry["file"]], entry["content_type"]
+
+    def urls(self):
+        return sorted(self._load_index())
+
+    def add(self, url):
+        """Download ``url`` into the cache."""
+        with urlopen(url, timeout=30) as response:
+            body = response.read()
+            content_type = response.headers.get("Content-Type", "application/octet-stream")
+        name = hashlib.sha256(url.encode()).hexdigest()
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, name), "wb") as f:
+            f.write(body)
+        index = dict(self._load_index())
+        index[url] = {"file": name, "content_type": content_type}
+        with open(os.path.join(self.directory, INDEX_NAME), "w") as f:
+            json.dump(index, f, indent=4, sort_keys=True)
+        self._index = index
+        return len(body)
+
+
+_cache = AssetCache()
+
+
+def is_local(url):
+    parts = urlsplit(url)
+    return parts.scheme not in ("http", "https") or parts.hostname in LOCAL_HOSTS
+
+
+def install(context, route, block_types=()):
+    """Route every request of ``context``; counts go under ``route``."""
+    if not INTERCEPT:
+        return
+    counts = _stats.setdefault(route, {"blocked": 0, "cached": 0, "aborted_external": 0})
+    block_types = frozenset(block_types)
+
+    def handle(intercepted):
+        request = intercepted.request
+        if request.resource_type in block_types:
+            counts["blocked"] += 1
+            intercepted.abort("blockedbyclient")
+        elif is_local(request.url):
+            intercepted.continue_()
+        else:
+            cached = _cache.lookup(request.url)
+            if cached is None:
+                counts["aborted_external"] += 1
+                intercepted.abort("blockedbyclient")
+            else:
+                counts["cached"] += 1
+                body, content_type = cached
+                intercepted.fulfill(
+                    status=200,
+                    body=body,
+                    content_type=content_type,
+                    headers={"Access-Control-Allow-Origin": "*"},
+                )
+
+    context.route("**/*", handle)
+
+
+def reset():
+    """Forget the counts, e.g. between submissions of a batch."""
+    _stats.clear()
+
+
+def summary():
+    """Per-route request counts for the results metadata."""
+    if not _stats:
+        return None
+    return {route: dict(counts) for route, counts in _stats.items()}
+
+
+def merge(summaries):
+    """Combine ``summary()`` results from several worker processes."""
+    merged = {}
+    for stats in summaries:
+        for route, counts in (stats or {}).items():
+            total = merged.setdefault(route, {})
+            for key, value in counts.items():
+                total[key] = total.get(key, 0) + value
+    return merged or None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the offline asset cache")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="download URLs into the cache")
+    add.add_argument("urls", nargs="+")
+    commands.add_parser("list", help="list cached URLs")
+    args = parser.parse_args()
+
+    if args.command == "add":
+        for url in args.urls:
+            size = _cache.add(url)
+            print(f"{url}: {size} bytes")
+    else:
+        for url in _cache.urls():
+            print(url)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""Run the grading suites across worker processes and merge the results.
+
+The discovered suite is split into units (whole modules or whole TestCase
+classes, so setUpClass/tearDownClass still pair up) and each worker process
+pulls units off a queue and runs them through its own GradingTestRunner and
+its own browser pool. The per-unit results are merged back in discovery
+order so results.json is identical in names, weights and ordering to a
+serial run.
+"""
+
+import io
+import json
+import multiprocessing
+import queue
+import time
+import unittest
+
+import network
+from browser_pool import get_pool, shutdown_pool
+from grading_runner import GradingTestRunner
+
+# Units are handed to workers by index; the list itself is inherited through
+# fork so TestCase instances never have to be pickled.
+_units = []
+
+
+def iter_tests(suite):
+    """Yield the individual tests of a (possibly nested) TestSuite in order."""
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from iter_tests(item)
+        else:
+            yield item
+
+
+def split_suite(suite, by="class"):
+    """Split ``suite`` into per-module or per-class TestSuites, in order."""
+    units = []
+    positions = {}
+    for test in iter_tests(suite):
+        cls = type(test)
+        if by == "module":
+            key = cls.__module__
+        else:
+            key = (cls.__module__, cls.__qualname__)
+        if key not in positions:
+            positions[key] = len(units)
+            units.append(unittest.TestSuite())
+        units[positions[key]].addTest(test)
+    return units
+
+
+def _run_unit(unit, visibility):
+    """Run one unit and return the JSON data the runner would write."""
+    captured = {}
+    runner = GradingTestRunner(
+        visibility=visibility, stream=io.StringIO(), post_processor=captured.update
+    )
+    started = time.time()
+    runner.run(unit)
+    captured["wall_seconds"] = round(time.time() - started, 3)
+    return captured
+
+
+def _worker_main(worker_id, tasks, results, visibility):
+    """Worker loop: run units until the sentinel, then report its stats."""
+    pool = get_pool()
+    try:
+        while True:
+            index = tasks.get()
+            if index is None:
+                break
+            results.put((index, worker_id, _run_unit(_units[index], visibility)))
+    finally:
+        results.put(
+            (
+                None,
+                worker_id,
+                {
+                    "browser_pool": pool.stats(),
+                    "network": network.summary(),
+                },
+            )
+        )
+        shutdown_pool()
+
+
+def _crashed_unit(unit):
+    """Failing results for a unit whose worker died before reporting."""
+    tests = []
+    for test in iter_tests(unit):
+        method = getattr(test, getattr(test, "_testMethodName", ""), None)
+        weight = getattr(method, "__weight__", None)
+        result = {
+            "name": test.shortDescription() or str(test),
+            "score": 0.0,
+            "max_score": weight if weight is not None else 0.0,
+            "status": "failed",
+            "output": "Test Failed: the grading worker running this test exited unexpectedly\n",
+        }
+        number = getattr(method, "__number__", None)
+        if number:
+            result["number"] = number
+        tests.append(result)
+    return {"tests": tests, "leaderboard": []}
+
+
+def run_parallel(suite, workers, stream, visibility=None, by="class", post_processor=None):
+    """Run ``suite`` on ``workers`` processes and write merged results.json."""
+    global _units
+    _units = split_suite(suite, by)
+    workers = max(1, min(workers, len(_units)))
+
+    ctx = multiprocessing.get_context("fork")
+    tasks = ctx.Queue()
+    results = ctx.Queue()
+    for index in range(len(_units)):
+        tasks.put(index)
+    for _ in range(workers):
+        tasks.put(None)
+
+    started = time.time()
+    procs = [
+        ctx.Process(target=_worker_main, args=(n, tasks, results, visibility))
+        for n in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+
+    unit_results = {}
+    worker_stats = {n: {"units": []} for n in range(workers)}
+    network_stats = []
+    finished = 0
+    while finished < workers:
+        try:
+            index, worker_id, payload = results.get(timeout=1)
+        except queue.Empty:
+            if not any(proc.is_alive() for proc in procs) and results.empty():
+                break
+            continue
+        if index is None:
+            worker_stats[worker_id]["browser_pool"] = payload["browser_pool"]
+            network_stats.append(payload["network"])
+            finished += 1
+        else:
+            unit_results[index] = payload
+            worker_stats[worker_id]["units"].append(index)
+    for proc in procs:
+        proc.join()
+
+    json_data = {"tests": [], "leaderboard": []}
+    if visibility:
+        json_data["visibility"] = visibility
+    for index, unit in enumerate(_units):
+        data = unit_results.get(index) or _crashed_unit(unit)
+        json_data["tests"].extend(data["tests"])
+        json_data["leaderboard"].extend(data.get("leaderboard", []))
+    json_data["execution_time"] = format(time.time() - started, "0.2f")
+    json_data["score"] = sum(test.get("score", 0.0) for test in json_data["tests"])
+
+    json_data["extra_data"] = {}
+    json_data["extra_data"]["parallel"] = {
+        "workers": workers,
+        "split": by,
+        "units": len(_units),
+        "unit_seconds": [
+            unit_results.get(index, {}).get("wall_seconds") for index in range(len(_units))
+        ],
+        "per_worker": [worker_stats[n] for n in range(workers)],
+    }
+    network_summary = network.merge(network_stats)
+    if network_summary is not None:
+        json_data["extra_data"]["network"] = network_summary
+    if post_processor is not None:
+        post_processor(json_data)
+
+    json.dump(json_data, stream, indent=4)
+    stream.write("\n")
+    return json_data
@@ -0,0 +1,50 @@
+"""Pick free TCP ports for student servers.
+
+    PORT=$(python3 ports.py)
+    read -r SERVER_PORT API_PORT <<< "$(python3 ports.py 2)"
+
+Ports needed together must come from one call: separate calls can hand out
+the same port, since nothing binds it in between.
+"""
+
+import argparse
+import socket
+
+# Ports handed out by this process, so concurrent callers never share one
+# even before the servers have bound them.
+_allocated = set()
+
+
+def free_port(host="127.0.0.1"):
+    """Return a port nothing is listening on and this process hasn't handed out."""
+    while True:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind((host, 0))
+            port = sock.getsockname()[1]
+        if port not in _allocated:
+            _allocated.add(port)
+            return port
+
+
+def base_url(port):
+    """Base URL the suites use for a server on ``port``."""
+    return f"http://localhost:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("count", type=int, nargs="?", default=1, help="how many ports")
+    parser.add_argument(
+        "--avoid",
+        type=int,
+        action="append",
+        default=[],
+        help="a port already taken, e.g. a fixed one from the environment",
+    )
+    args = parser.parse_args()
+    _allocated.update(args.avoid)
+    print(" ".join(str(free_port()) for _ in range(args.count)))
+
+
+if __name__ == "__main__":
+    main()
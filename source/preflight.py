@@ -0,0 +1,102 @@
+"""Probe the routes the suites depend on before any browser work starts.
+
+Suites report their routes through ``required_routes()`` (see grader_base)
+and tests that need more through ``@requires_route``. test_main.py probes
+each route once up front; every test whose suite or own route is missing
+or broken is then failed straight away with the probe's message, instead
+of waiting out navigation and locator timeouts one test at a time. Tests
+of the same suite that use only working routes still run.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+
+PROBE_TIMEOUT = 5
+
+# route -> failure message, for the routes whose probe failed.
+_failures = {}
+_probed = {}
+# Failed routes that timed out or refused the connection rather than
+# answering with an error status; such failures may not happen again.
+_unreachable = set()
+
+
+def _check(base_url, route, timeout):
+    """(failure message or None, True if the server gave no answer at all)."""
+    try:
+        with urlopen(base_url + route, timeout=timeout) as response:
+            response.read()
+    except HTTPError as error:
+        return f"GET {route} returned {error.code} {error.reason}", False
+    except URLError as error:
+        if isinstance(error.reason, TimeoutError):
+            return f"GET {route} timed out after {timeout * 1000:.0f} ms", True
+        return f"GET {route} failed: {error.reason}", True
+    except TimeoutError:
+        return f"GET {route} timed out after {timeout * 1000:.0f} ms", True
+    except OSError as error:
+        return f"GET {route} failed: {error}", True
+    return None, False
+
+
+def probe(base_url, route, timeout=PROBE_TIMEOUT):
+    """Return None if ``route`` answers with a success status, else why not."""
+    return _check(base_url, route, timeout)[0]
+
+
+def run_preflight(base_url, routes):
+    """Probe every route concurrently and remember the failures."""
+    routes = sorted(set(routes))
+    _failures.clear()
+    _probed.clear()
+    _unreachable.clear()
+    with ThreadPoolExecutor(max_workers=max(1, len(routes))) as executor:
+        checks = executor.map(lambda r: _check(base_url, r, PROBE_TIMEOUT), routes)
+        for route, (failure, unreachable) in zip(routes, checks):
+            _probed[route] = failure is None
+            if failure is not None:
+                _failures[route] = failure
+            if unreachable:
+                _unreachable.add(route)
+    return dict(_failures)
+
+
+def test_routes(test):
+    """Routes ``test`` needs besides its suite's (``@requires_route``)."""
+    method = getattr(test, getattr(test, "_testMethodName", ""), None)
+    return getattr(method, "__required_routes__", ())
+
+
+def required_routes(tests):
+    """The union of the routes required by ``tests`` and their classes.
+
+    Skipped suites (e.g. the load suite unless enabled) need none.
+    """
+    routes = set()
+    for test in tests:
+        if getattr(type(test), "__unittest_skip__", False):
+            continue
+        if hasattr(type(test), "required_routes"):
+            routes.update(type(test).required_routes())
+        routes.update(test_routes(test))
+    return routes
+
+
+def failure_for(routes):
+    """Message for the first failed route in ``routes``, or None."""
+    for route in routes:
+        if route in _failures:
+            return f"Route {route} is not available ({_failures[route]}), so this test was not run."
+    return None
+
+
+def summary():
+    """Preflight results for the results metadata."""
+    if not _probed:
+        return None
+    return {
+        "routes": dict(_probed),
+        "failures": dict(_failures),
+        "unreachable": sorted(_unreachable),
+    }
@@ -0,0 +1,231 @@
+"""Reuse results.json for byte-identical resubmissions.
+
+    python3 result_cache.py lookup /autograder/submission --output results.json
+    python3 result_cache.py store /autograder/submission results.json
+
+Entries are keyed by a hash of the submission's files together with a hash
+of the grader (``GRADER_SOURCES``, every module that can change a score,
+and the grading settings in ``GRADING_ENV``), so editing any of them or
+grading in another mode invalidates everything cached under the old key;
+those entries are dropped the next time something is stored. Results with
+failures a rerun might not repeat (``unrepeatable_failures``: a spent time
+budget, a supervisor restart or a failed preflight probe) are not stored. The cache is a directory of
+JSON files (AUTOGRADER_RESULT_CACHE_DIR) kept under
+AUTOGRADER_RESULT_CACHE_MB by evicting the least recently used entries.
+Set AUTOGRADER_RESULT_CACHE=0 to turn it off.
+
+``lookup`` exits 0 and writes the stored results on a hit, 1 on a miss.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+
+ENABLED = os.environ.get("AUTOGRADER_RESULT_CACHE", "1") != "0"
+CACHE_DIR = os.environ.get("AUTOGRADER_RESULT_CACHE_DIR", "/autograder/result_cache")
+MAX_BYTES = int(float(os.environ.get("AUTOGRADER_RESULT_CACHE_MB", "64")) * 1024 * 1024)
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Files whose content decides what a submission scores.
+GRADER_SOURCES = ("*.py", "stock_fixtures.json")
+# Settings that change how a submission is graded.
+GRADING_ENV = (
+    "AUTOGRADER_DOM_MODE",
+    "AUTOGRADER_PSEUDO_MODE",
+    "AUTOGRADER_REUSE_PAGES",
+    "AUTOGRADER_SUITE_BUDGET_MS",
+    "AUTOGRADER_COLD_TIMEOUT_MS",
+    "AUTOGRADER_WARM_TIMEOUT_MS",
+    "AUTOGRADER_INTERCEPT_NETWORK",
+    "AUTOGRADER_ASSET_CACHE",
+    "AUTOGRADER_STOCK_API_LATENCY_MS",
+    "AUTOGRADER_MAX_RSS_MB",
+    "AUTOGRADER_MAX_FDS",
+    "AUTOGRADER_MAX_CPU_PERCENT",
+    "AUTOGRADER_LOAD_SUITE",
+    "AUTOGRADER_LOAD_CLIENTS",
+    "AUTOGRADER_LOAD_REQUESTS",
+    "AUTOGRADER_LOAD_MIN_RPS",
+    "AUTOGRADER_LOAD_MAX_P99_MS",
+    "AUTOGRADER_LOAD_MAX_ERROR_RATE",
+)
+# Never part of a submission's identity.
+IGNORED_DIRS = {"__pycache__", ".git"}
+IGNORED_SUFFIXES = (".pyc",)
+
+
+def _hash_files(root, paths, digest):
+    for path in sorted(paths):
+        digest.update(os.path.relpath(path, root).encode())
+        digest.update(b"\0")
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+
+
+def submission_files(submission):
+    """Every file of the submission that could change its results."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(submission):
+        dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+        files.extend(
+            os.path.join(dirpath, name)
+            for name in filenames
+            if not name.endswith(IGNORED_SUFFIXES)
+        )
+    return files
+
+
+def grader_files(source_dir=SOURCE_DIR, exclude=()):
+    """The grader's files in ``source_dir``, without those named in ``exclude``."""
+    exclude = set(exclude)
+    paths = set()
+    for pattern in GRADER_SOURCES:
+        paths.update(glob.glob(os.path.join(source_dir, pattern)))
+    return {p for p in paths if os.path.relpath(p, source_dir) not in exclude}
+
+
+def grader_hash(source_dir=SOURCE_DIR, exclude=()):
+    """Hash of the grader and its settings; changes whenever either does.
+
+    run_autograder copies the submission over the source directory, so
+    files named in ``exclude`` (the submission's own) are left out.
+    """
+    digest = hashlib.sha256()
+    _hash_files(source_dir, grader_files(source_dir, exclude), digest)
+    digest.update(grading_settings().encode())
+    return digest.hexdigest()[:16]
+
+
+def grading_settings():
+    """The ``GRADING_ENV`` settings of this run, as one string."""
+    return "".join(f"{name}={os.environ.get(name, '')}\0" for name in GRADING_ENV)
+
+
+def unrepeatable_failures(results, tests=None, routes=None):
+    """Why failures in ``results`` might not happen again; empty if none.
+
+    Only ``tests`` (default: all of them) and, for the preflight, only
+    ``routes`` (default: all probed) are looked at.
+    """
+    reasons = []
+    extra = results.get("extra_data") or {}
+    if (extra.get("server_resources") or {}).get("events"):
+        reasons.append("the server was restarted or stopped")
+    # A route that answered with an error status will answer the same way
+    # again; only timeouts and refused connections may not repeat.
+    unreachable = set((extra.get("preflight") or {}).get("unreachable") or ())
+    if routes is not None:
+        unreachable &= set(routes)
+    if unreachable:
+        reasons.append("preflight could not reach " + ", ".join(sorted(unreachable)))
+    for test in results.get("tests", []) if tests is None else tests:
+        extra = test.get("extra_data") or {}
+        if test.get("status") == "failed" and (extra.get("time_budget") or {}).get("exhausted"):
+            reasons.append(f"the time budget of {extra.get('suite')} was used up")
+            break
+    return reasons
+
+
+def submission_hash(submission):
+    digest = hashlib.sha256()
+    _hash_files(submission, submission_files(submission), digest)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES, grader=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.grader = grader or grader_hash()
+
+    def _path(self, submission):
+        return os.path.join(self.directory, f"{self.grader}-{submission_hash(submission)}.json")
+
+    def lookup(self, submission):
+        """Stored results for ``submission``, or None."""
+        path = self._path(submission)
+        try:
+            with open(path) as f:
+                results = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # The modification time is the LRU clock.
+        os.utime(path)
+        results.setdefault("extra_data", {})["result_cache"] = {
+            "hit": True,
+            "key": os.path.basename(path)[:-5],
+        }
+        return results
+
+    def store(self, submission, results):
+        """Cache ``results`` for ``submission`` and enforce the size bound."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(submission)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(results, f)
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self):
+        """Drop entries of other test sources, then the LRU ones over the cap."""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not name.endswith(".json"):
+                continue
+            if not name.startswith(self.grader + "-"):
+                os.remove(path)
+                continue
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-hash cache of results.json")
+    commands = parser.add_subparsers(dest="command", required=True)
+    lookup = commands.add_parser("lookup", help="write cached results on a hit")
+    lookup.add_argument("submission")
+    lookup.add_argument("--output", required=True)
+    store = commands.add_parser("store", help="cache a finished results.json")
+    store.add_argument("submission")
+    store.add_argument("results")
+    args = parser.parse_args()
+
+    if not ENABLED:
+        return 1
+    own_files = [os.path.relpath(p, args.submission) for p in submission_files(args.submission)]
+    cache = ResultCache(grader=grader_hash(exclude=own_files))
+    if args.command == "lookup":
+        started = time.perf_counter()
+        results = cache.lookup(args.submission)
+        if results is None:
+            return 1
+        results["extra_data"]["result_cache"]["lookup_seconds"] = round(
+            time.perf_counter() - started, 4
+        )
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+        return 0
+    with open(args.results) as f:
+        results = json.load(f)
+    reasons = unrepeatable_failures(results)
+    if reasons:
+        print("Not caching these results: " + "; ".join(reasons), file=sys.stderr)
+        return 1
+    cache.store(args.submission, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
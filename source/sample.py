@@ -1,26 +1,13 @@
-import unittest
-from playwright.sync_api import sync_playwright
 from gradescope_utils.autograder_utils.decorators import weight
-import json
 
+from grader_base import BrowserTestCase
 
-class TestStockForm(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        """Set up Playwright and browser instance before all tests."""
-        cls.playwright = sync_playwright().start()
-        cls.browser = cls.playwright.firefox.launch(headless=True)
-        cls.page = cls.browser.new_page()
 
-    @classmethod
-    def tearDownClass(cls):
-        """Clean up after all tests are done."""
-        cls.browser.close()
-        cls.playwright.stop()
-
-    def setUp(self):
-        """Navigate to the stock page before each test."""
-        self.page.goto("http://localhost:6543/stock")
+class TestStockForm(BrowserTestCase):
+    ROUTE = "/stock"
+    BLOCK_RESOURCE_TYPES = ("image", "font", "media")
+    # Every test fills in and submits forms.
+    MUTATES_PAGE = True
 
     @weight(3)
     def test_01_form_structure(self):
@@ -58,7 +45,7 @@ class TestStockForm(unittest.TestCase):
         # Check if we're still on the same page (form didn't submit)
         self.assertEqual(
             self.page.url,
-            "http://localhost:6543/stock",
+            self.url("/stock"),
             "Empty form should not be submitted",
         )
 
@@ -66,17 +53,17 @@ class TestStockForm(unittest.TestCase):
     def test_03_initial_stock_endpoints(self):
         """Test that stock endpoints return empty JSON initially"""
 
-        def check_endpoint(number):
-            response = self.page.request.get(f"http://localhost:6543/stock/{number}")
-            self.assertEqual(response.status, 200)
+        # In the browser's session, as page.request sent them
+        responses = self.http.get_all(
+            (f"/stock/{number}" for number in range(1, 4)), browser_cookies=True
+        )
+        for number, response in enumerate(responses, start=1):
+            self.assertEqual(response.status_code, 200)
             data = response.json()
             self.assertEqual(
                 data, {}, f"Stock endpoint {number} should return empty JSON initially"
             )
 
-        for i in range(1, 4):
-            check_endpoint(i)
-
     @weight(5)
     def test_04_form_submission_redirect(self):
         """Test form submission and redirect"""
@@ -93,7 +80,7 @@ class TestStockForm(unittest.TestCase):
         # Check redirect
         self.assertEqual(
             self.page.url,
-            "http://localhost:6543/stock/page",
+            self.url("/stock/page"),
             "Should redirect to /stock/page after submission",
         )
 
@@ -110,10 +97,13 @@ class TestStockForm(unittest.TestCase):
         submit_input = self.page.locator("input[type='submit']")
         submit_input.click()
 
-        # Now check each endpoint for correct data structure
-        def verify_endpoint(number):
-            response = self.page.request.get(f"http://localhost:6543/stock/{number}")
-            self.assertEqual(response.status, 200)
+        # Now check each endpoint for correct data structure, in the session
+        # the form submission used
+        responses = self.http.get_all(
+            (f"/stock/{number}" for number in range(1, 4)), browser_cookies=True
+        )
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
             data = response.json()
 
             # Verify the response has all required fields
@@ -121,6 +111,3 @@ class TestStockForm(unittest.TestCase):
             for field in required_fields:
                 self.assertIn(field, data, f"Response should contain {field}")
                 self.assertIsNotNone(data[field], f"{field} should not be null")
-
-        for i in range(1, 4):
-            verify_endpoint(i)
@@ -0,0 +1,40 @@
+"""Run a student's app.py exactly like ``python3 app.py``, but on a chosen port.
+
+Student servers hardcode their port in ``uvicorn.run(...)``. To run several
+of them side by side, ``uvicorn.run`` is wrapped so the ``port`` argument is
+replaced before app.py executes as ``__main__``; everything else the student
+passes through is left alone.
+
+    python3 serve_submission.py --port 7001 app.py
+"""
+
+import argparse
+import os
+import runpy
+import sys
+
+import uvicorn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("app", nargs="?", default="app.py")
+    args = parser.parse_args()
+
+    run = uvicorn.run
+
+    def run_on_port(app, *run_args, **run_kwargs):
+        run_kwargs["port"] = args.port
+        return run(app, *run_args, **run_kwargs)
+
+    uvicorn.run = run_on_port
+
+    app_path = os.path.abspath(args.app)
+    sys.argv = [app_path]
+    sys.path.insert(0, os.path.dirname(app_path))
+    runpy.run_path(app_path, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""Run the student's server under resource limits and record its usage.
+
+    python3 server_supervisor.py --timeline server_resources.json --log fastapi.log \\
+        -- python3 serve_submission.py --port 7001 app.py
+
+Starts the command in a process group of its own and samples the whole
+process tree from /proc: CPU use, resident memory and open file
+descriptors. A server that goes over ``--max-rss-mb`` or ``--max-fds``,
+keeps the CPU over ``--max-cpu-percent`` busy on average for
+``--cpu-window`` seconds, or with ``--probe-url`` stops answering HTTP
+(a blocked event loop) is restarted, up to ``--max-restarts`` times, and
+then terminated. With ``--log`` the server's output goes to a log of
+bounded size (log_capture.py) rather than to the supervisor's stdout.
+
+The supervisor exits with the server's status when the server exits on its
+own, and with ``TERMINATED`` once it has terminated the server for good, so
+run_autograder can use its PID as the server's. On SIGTERM it stops
+the server's whole process group. The timeline and every restart or stop
+are rewritten to ``--timeline`` as JSON every few samples; test_main.py
+puts it into the hidden ``extra_data.server_resources`` and turns any
+intervention into a visible message in results.json (``results_entry``).
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from collections import deque
+from urllib.request import urlopen
+
+from log_capture import LogCapture
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+# Samples kept in the timeline; older ones are thinned out to fit.
+MAX_SAMPLES = 600
+WRITE_EVERY = 4
+STOP_GRACE_SECONDS = 3
+# Exit status after terminating the server for going over a limit.
+TERMINATED = 75
+
+
+def _children_map():
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def process_tree(pid):
+    """``pid`` and all of its descendants."""
+    children = _children_map()
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+
+def sample_process(pid):
+    """(cpu seconds, rss bytes, open fds) of one process, or None if gone."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as f:
+            rss_pages = int(f.read().split()[1])
+        fds = len(os.listdir(f"/proc/{pid}/fd"))
+    except (OSError, IndexError, ValueError):
+        return None
+    # utime and stime are fields 14 and 15 of stat, 12 and 13 after ")".
+    cpu = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    return cpu, rss_pages * PAGE_SIZE, fds
+
+
+def sample_tree(pid):
+    """Summed (cpu seconds, rss bytes, open fds) of ``pid``'s process tree."""
+    cpu = rss = fds = 0
+    for member in process_tree(pid):
+        sample = sample_process(member)
+        if sample is not None:
+            cpu += sample[0]
+            rss += sample[1]
+            fds += sample[2]
+    return cpu, rss, fds
+
+
+def responds(url, timeout):
+    try:
+        with urlopen(url, timeout=timeout) as response:
+            response.read()
+        return True
+    except OSError as error:
+        # Any HTTP status means the server is still answering.
+        return hasattr(error, "code")
+
+
+class Supervisor:
+    def __init__(self, command, args):
+        self.command = command
+        self.args = args
+        self.log = LogCapture(args.log) if args.log else None
+        self.log_thread = None
+        self.proc = None
+        self.started = time.time()
+        self.samples = []
+        self.events = []
+        self.restarts = 0
+        self.stopped = False
+
+    def start_server(self):
+        if self.log is None:
+            self.proc = subprocess.Popen(self.command, start_new_session=True)
+        else:
+            self.proc = subprocess.Popen(
+                self.command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+            self.log_thread = self.log.follow_in_background(self.proc.stdout, close=False)
+        self._cpu_history = deque()
+        self._answered = False
+        self._unresponsive = 0
+        self._last = None
+
+    def stop_server(self):
+        """SIGTERM the server's process group, SIGKILL it if it lingers."""
+        if self.proc is None or self.proc.poll() is not None:
+            return
+        try:
+            os.killpg(self.proc.pid, signal.SIGTERM)
+            self.proc.wait(timeout=STOP_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+            self.proc.wait()
+        except ProcessLookupError:
+            pass
+        self.drain_log()
+
+    def drain_log(self):
+        """Wait until everything the server printed is in the log."""
+        if self.log_thread is not None:
+            # A process that left the group could hold the pipe open forever.
+            self.log_thread.join(timeout=STOP_GRACE_SECONDS)
+            self.log_thread = None
+
+    def _elapsed(self):
+        return round(time.time() - self.started, 2)
+
+    def sample(self):
+        """Record one sample; returns the violated limit, if any."""
+        now = time.monotonic()
+        cpu, rss, fds = sample_tree(self.proc.pid)
+        cpu_percent = 0.0
+        if self._last is not None:
+            cpu_percent = 100 * (cpu - self._last[1]) / max(now - self._last[0], 1e-6)
+        self._last = (now, cpu)
+        rss_mb = rss / (1024 * 1024)
+        self.samples.append([self._elapsed(), round(cpu_percent, 1), round(rss_mb, 1), fds])
+        if len(self.samples) > MAX_SAMPLES:
+            # Keep the first sample and every other one after it.
+            self.samples = self.samples[:1] + self.samples[2::2]
+
+        args = self.args
+        if rss_mb > args.max_rss_mb:
+            return f"used {rss_mb:.0f} MB of memory (limit {args.max_rss_mb:.0f} MB)"
+        if fds > args.max_fds:
+            return f"had {fds} open files (limit {args.max_fds})"
+        # Average over the whole window; single samples are too coarse.
+        history = self._cpu_history
+        history.append((now, cpu))
+        while len(history) > 1 and now - history[1][0] >= args.cpu_window:
+            history.popleft()
+        span = now - history[0][0]
+        if span >= args.cpu_window:
+            average = 100 * (cpu - history[0][1]) / span
+            if average > args.max_cpu_percent:
+                return (
+                    f"kept the CPU {average:.0f}% busy for {span:.0f} seconds "
+                    f"(limit {args.max_cpu_percent:.0f}%)"
+                )
+        if args.probe_url and len(self.samples) % args.probe_every == 0:
+            if responds(args.probe_url, args.probe_timeout):
+                self._answered = True
+                self._unresponsive = 0
+            elif self._answered:
+                # Only a server that has answered before can stop answering;
+                # startup is wait_for_server.py's business.
+                self._unresponsive += 1
+                if self._unresponsive >= args.max_unresponsive:
+                    return (
+                        f"did not answer {args.probe_url} within {args.probe_timeout:.0f} s "
+                        f"{self._unresponsive} times in a row"
+                    )
+        return None
+
+    def enforce(self, reason):
+        self.stop_server()
+        action = "restarted" if self.restarts < self.args.max_restarts else "terminated"
+        self.events.append({"at": self._elapsed(), "action": action, "reason": reason})
+        if self.log is not None:
+            with self.log.lock:
+                notice = f"\n[autograder] Your server {reason}, so the autograder {action} it.\n"
+                self.log.write(notice.encode())
+                self.log.flush()
+        if action == "restarted":
+            self.restarts += 1
+            self.start_server()
+        else:
+            self.stopped = True
+
+    def timeline(self):
+        peak = lambda column: max((s[column] for s in self.samples), default=None)
+        return {
+            "interval_seconds": self.args.interval,
+            "limits": {
+                "max_rss_mb": self.args.max_rss_mb,
+                "max_fds": self.args.max_fds,
+                "max_cpu_percent": self.args.max_cpu_percent,
+                "cpu_window_seconds": self.args.cpu_window,
+            },
+            "peak_cpu_percent": peak(1),
+            "peak_rss_mb": peak(2),
+            "peak_fds": peak(3),
+            "samples": {"columns": ["seconds", "cpu_percent", "rss_mb", "fds"], "rows": self.samples},
+            "events": self.events,
+        }
+
+    def write(self):
+        if not self.args.timeline:
+            return
+        tmp = self.args.timeline + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.timeline(), f)
+        os.replace(tmp, self.args.timeline)
+
+    def run(self):
+        self.start_server()
+        count = 0
+        while True:
+            status = self.proc.poll()
+            if status is not None:
+                self.drain_log()
+                self.write()
+                return status
+            reason = self.sample()
+            if reason is not None:
+                self.enforce(reason)
+                self.write()
+                if self.stopped:
+                    # The server is gone for good; exiting lets anything
+                    # waiting on this PID (wait_for_server.py) see so.
+                    return TERMINATED
+            count += 1
+            if count % WRITE_EVERY == 0:
+                self.write()
+            time.sleep(self.args.interval)
+
+
+def results_entry(path):
+    """A visible 0/0 test explaining restarts or a stop, or None."""
+    try:
+        with open(path) as f:
+            events = json.load(f).get("events", [])
+    except (OSError, ValueError):
+        return None
+    if not events:
+        return None
+    lines = [
+        f"After {event['at']:.0f} s your server {event['reason']}, so the autograder "
+        f"{event['action']} it."
+        for event in events
+    ]
+    if events[-1]["action"] == "terminated":
+        lines.append("Tests that ran after that could not reach your server.")
+    return {
+        "name": "Your server was stopped or restarted for using too many resources",
+        "score": 0,
+        "max_score": 0,
+        "status": "failed",
+        "output": "\n".join(lines) + "\n",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a server under resource limits")
+    parser.add_argument("--timeline", help="write the resource timeline JSON here")
+    parser.add_argument("--log", help="capture the server's output into this bounded log")
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between samples")
+    parser.add_argument(
+        "--max-rss-mb", type=float, default=float(os.environ.get("AUTOGRADER_MAX_RSS_MB", "1024"))
+    )
+    parser.add_argument("--max-fds", type=int, default=int(os.environ.get("AUTOGRADER_MAX_FDS", "1024")))
+    parser.add_argument(
+        "--max-cpu-percent",
+        type=float,
+        default=float(os.environ.get("AUTOGRADER_MAX_CPU_PERCENT", "90")),
+    )
+    parser.add_argument("--cpu-window", type=float, default=20.0, help="seconds of sustained CPU")
+    parser.add_argument("--probe-url", help="URL that must keep answering")
+    parser.add_argument("--probe-every", type=int, default=4, help="probe every N samples")
+    parser.add_argument("--probe-timeout", type=float, default=5.0)
+    parser.add_argument("--max-unresponsive", type=int, default=3)
+    parser.add_argument("--max-restarts", type=int, default=1)
+    parser.add_argument("command", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("no server command given")
+
+    supervisor = Supervisor(command, args)
+
+    def on_term(signum, frame):
+        supervisor.stop_server()
+        supervisor.write()
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, on_term)
+    signal.signal(signal.SIGINT, on_term)
+    return supervisor.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
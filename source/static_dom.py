@@ -0,0 +1,478 @@
+"""Structural DOM checks against the served HTML without a browser.
+
+Most HTML assertions only count elements matching a selector or look at
+where an element sits in the tree. ``StaticQueries`` answers those from the
+HTML the student's server returns, parsed with the standard library.
+``BrowserQueries`` answers the same questions from a live Playwright page,
+and ``ParityQueries`` runs both and fails on any disagreement, which is how
+the static path is checked against the browser.
+
+Supported selectors: type, ``#id``, ``.class``, ``[attr]``, ``[attr=v]``,
+``[attr*=v]``, ``[attr^=v]``, ``[attr$=v]``, ``[attr~=v]`` compounds joined
+by descendant (space) or child (``>``) combinators. As in the browser,
+values of attributes such as ``type`` compare case-insensitively, the
+contents of a <template> are not part of the document (query them with
+``within="template"``) and table rows get their implicit <tbody>.
+
+The static answers are the served HTML's, so they only agree with the
+browser for markup that is there before any script runs. Elements a
+page's scripts add, move or remove at load are invisible here; checks on
+those need DOM_MODE=browser. ``text`` is the markup's text content, not
+the rendered ``innerText``: CSS ``text-transform`` and hidden elements
+change the latter only, so tests comparing visible text read the page.
+"""
+
+import re
+from html.parser import HTMLParser
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+HEAD_ELEMENTS = {"base", "link", "meta", "noscript", "script", "style", "template", "title"}
+# Browsers keep appending content after </body> or </html> to <body>.
+IGNORED_END_TAGS = {"html", "body"}
+# Table elements a new row, cell or section implicitly closes.
+TABLE_SECTIONS = {"tbody", "thead", "tfoot"}
+TABLE_CLOSES = {
+    "td": {"td", "th"},
+    "th": {"td", "th"},
+    "tr": {"td", "th", "tr"},
+    **{section: {"td", "th", "tr"} | TABLE_SECTIONS for section in TABLE_SECTIONS},
+}
+# Starting one of these implicitly closes an open <p>.
+CLOSES_P = {
+    "address", "article", "aside", "div", "dl", "fieldset", "footer", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "main", "nav", "ol",
+    "p", "pre", "section", "table", "ul",
+}
+# HTML attributes whose values selectors match case-insensitively.
+CASE_INSENSITIVE_ATTRS = {
+    "accept", "accept-charset", "align", "alink", "axis", "bgcolor", "charset",
+    "checked", "clear", "codetype", "color", "compact", "declare", "defer",
+    "dir", "direction", "disabled", "enctype", "face", "frame", "hreflang",
+    "http-equiv", "lang", "language", "link", "media", "method", "multiple",
+    "nohref", "noresize", "noshade", "nowrap", "readonly", "rel", "rev",
+    "rules", "scope", "scrolling", "selected", "shape", "target", "text",
+    "type", "valign", "valuetype", "vlink",
+}
+
+
+class Element:
+    """A parsed element; ``children`` holds elements and text strings.
+
+    As in the browser, a <template>'s children live in its ``content``
+    fragment, which has no parent, rather than in the template itself.
+    """
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self.parent = parent
+        self.children = []
+        self.content = None
+        if tag == "template":
+            self.content = Element("#document-fragment")
+            self.content.host = self
+
+    @property
+    def elements(self):
+        return [child for child in self.children if isinstance(child, Element)]
+
+    def iter(self):
+        """Yield every descendant element in document order."""
+        for child in self.elements:
+            yield child
+            yield from child.iter()
+
+    def text(self):
+        parts = []
+        for child in self.children:
+            parts.append(child.text() if isinstance(child, Element) else child)
+        return "".join(parts)
+
+    def contains(self, other):
+        while other is not None:
+            if other is self:
+                return True
+            other = other.parent
+        return False
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element("#document")
+        self.current = self.root
+
+    @staticmethod
+    def _up(node):
+        # Closing a template's content fragment returns to the template.
+        return node.parent if node.parent is not None else node.host
+
+    def _open(self, tag, attrs=()):
+        element = Element(tag, attrs, self.current)
+        self.current.children.append(element)
+        if tag not in VOID_ELEMENTS:
+            self.current = element.content or element
+
+    def _table_context(self, tag):
+        """Close and insert table elements the way a browser's parser does."""
+        while self.current.tag in TABLE_CLOSES[tag]:
+            self.current = self.current.parent
+        if tag in ("tr", "td", "th") and self.current.tag == "table":
+            self._open("tbody")
+        if tag in ("td", "th") and self.current.tag in TABLE_SECTIONS:
+            self._open("tr")
+
+    def handle_starttag(self, tag, attrs):
+        if self.current.tag == "head" and tag not in HEAD_ELEMENTS:
+            self.current = self.current.parent
+        if self.current.tag == "p" and tag in CLOSES_P:
+            self.current = self.current.parent
+        if self.current.tag == "li" and tag == "li":
+            self.current = self.current.parent
+        if tag in TABLE_CLOSES:
+            self._table_context(tag)
+        self._open(tag, [(name, value or "") for name, value in attrs])
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.current = self._up(self.current)
+
+    def handle_endtag(self, tag):
+        if tag in IGNORED_END_TAGS:
+            return
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = self._up(node)
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def _normalise(root):
+    """Give the tree the html/head/body skeleton a browser would build."""
+    html = next((el for el in root.elements if el.tag == "html"), None)
+    if html is None:
+        html = Element("html", parent=root)
+        html.children, root.children = root.children, [html]
+        for child in html.elements:
+            child.parent = html
+    head = next((el for el in html.elements if el.tag == "head"), None)
+    body = next((el for el in html.elements if el.tag == "body"), None)
+    if head is None:
+        head = Element("head", parent=html)
+    if body is None:
+        body = Element("body", parent=html)
+    # Leading metadata elements belong to <head>; other stray content goes
+    # to <body>, before its own children if it came before the body tag.
+    before_body = []
+    after_body = []
+    seen_body = seen_content = False
+    for child in html.children:
+        if child is body:
+            seen_body = True
+        elif child is head:
+            continue
+        elif isinstance(child, str):
+            if child.strip():
+                seen_content = True
+                (after_body if seen_body else before_body).append(child)
+        elif child.tag in HEAD_ELEMENTS and not seen_body and not seen_content:
+            head.children.append(child)
+            child.parent = head
+        else:
+            seen_content = True
+            child.parent = body
+            (after_body if seen_body else before_body).append(child)
+    body.children = before_body + body.children + after_body
+    html.children = [head, body]
+    return root
+
+
+def parse_html(text):
+    """Parse ``text`` into an Element tree rooted at ``#document``."""
+    builder = _TreeBuilder()
+    builder.feed(text)
+    builder.close()
+    return _normalise(builder.root)
+
+
+_COMPOUND_RE = re.compile(
+    r"""
+    (?P<tag>[a-zA-Z][\w-]*|\*)
+    | \#(?P<id>[\w-]+)
+    | \.(?P<cls>[\w-]+)
+    | \[\s*(?P<attr>[\w-]+)\s*
+        (?:(?P<op>[*^$~]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+))\s*)?
+      \]
+    """,
+    re.VERBOSE,
+)
+
+
+def _parse_compound(text):
+    tests = []
+    pos = 0
+    while pos < len(text):
+        match = _COMPOUND_RE.match(text, pos)
+        if match is None:
+            raise ValueError(f"Unsupported selector: {text!r}")
+        tests.append(match)
+        pos = match.end()
+    return tests
+
+
+def _tokenize(selector):
+    """Split a selector into compounds and combinators, respecting [...]."""
+    tokens = []
+    current = ""
+    depth = 0
+    quote = None
+    for char in selector.strip():
+        if quote:
+            current += char
+            if char == quote:
+                quote = None
+        elif char in "\"'" and depth:
+            quote = char
+            current += char
+        elif char == "[":
+            depth += 1
+            current += char
+        elif char == "]":
+            depth -= 1
+            current += char
+        elif not depth and (char.isspace() or char == ">"):
+            if current:
+                tokens.append(current)
+                current = ""
+            if char == ">":
+                tokens.append(">")
+        else:
+            current += char
+    if current:
+        tokens.append(current)
+    parsed = []
+    combinator = " "
+    for token in tokens:
+        if token == ">":
+            combinator = ">"
+            continue
+        parsed.append((combinator, _parse_compound(token)))
+        combinator = " "
+    return parsed
+
+
+def _matches_compound(element, tests):
+    for test in tests:
+        if test["tag"]:
+            if test["tag"] != "*" and element.tag != test["tag"].lower():
+                return False
+        elif test["id"]:
+            if element.attrs.get("id") != test["id"]:
+                return False
+        elif test["cls"]:
+            if test["cls"] not in element.attrs.get("class", "").split():
+                return False
+        else:
+            name = test["attr"].lower()
+            actual = element.attrs.get(name)
+            if actual is None:
+                return False
+            op = test["op"]
+            if op is None:
+                continue
+            expected = next(v for v in (test["dq"], test["sq"], test["bare"]) if v is not None)
+            if name in CASE_INSENSITIVE_ATTRS:
+                actual, expected = actual.lower(), expected.lower()
+            if op == "=" and actual != expected:
+                return False
+            if op == "*=" and (not expected or expected not in actual):
+                return False
+            if op == "^=" and (not expected or not actual.startswith(expected)):
+                return False
+            if op == "$=" and (not expected or not actual.endswith(expected)):
+                return False
+            if op == "~=" and expected not in actual.split():
+                return False
+    return True
+
+
+def _matches(element, compounds):
+    """Match right-to-left against the element's ancestors."""
+    combinator, tests = compounds[-1]
+    if not _matches_compound(element, tests):
+        return False
+    if len(compounds) == 1:
+        return True
+    parent = element.parent
+    while parent is not None and parent.tag not in ("#document", "#document-fragment"):
+        if _matches(parent, compounds[:-1]):
+            return True
+        if combinator == ">":
+            return False
+        parent = parent.parent
+    return False
+
+
+def select(root, selector):
+    """All descendants of ``root`` matching ``selector``, in document order."""
+    compounds = _tokenize(selector)
+    return [el for el in root.iter() if _matches(el, compounds)]
+
+
+class StaticQueries:
+    """DOM queries answered from the served HTML."""
+
+    def __init__(self, document):
+        self.document = document
+
+    @classmethod
+    def fetch(cls, url, timeout=10):
+        """Fetch ``url`` once and parse it; error pages are parsed as-is."""
+        try:
+            with urlopen(url, timeout=timeout) as response:
+                body = response.read()
+                charset = response.headers.get_content_charset() or "utf-8"
+        except HTTPError as error:
+            body = error.read()
+            charset = error.headers.get_content_charset() or "utf-8"
+        return cls(parse_html(body.decode(charset, errors="replace")))
+
+    def _root(self, within, index):
+        if within is None:
+            return self.document
+        matches = select(self.document, within)
+        if index >= len(matches):
+            return None
+        # A template is queried through its content, as in the browser.
+        return matches[index].content or matches[index]
+
+    def count(self, selector, within=None, index=0):
+        """Number of matches, optionally inside the ``index``-th ``within``."""
+        root = self._root(within, index)
+        return 0 if root is None else len(select(root, selector))
+
+    def text(self, selector):
+        """Whitespace-normalised text content of the first match, or None.
+
+        Not ``innerText``; see the module docstring.
+        """
+        matches = select(self.document, selector)
+        return " ".join(matches[0].text().split()) if matches else None
+
+    def parent_tag(self, selector):
+        """Tag name of the first match's parent, or None."""
+        matches = select(self.document, selector)
+        if not matches or matches[0].parent is None:
+            return None
+        return matches[0].parent.tag
+
+    def last_child(self, selector):
+        """``{"tag", "attrs"}`` of the first match's last element child."""
+        matches = select(self.document, selector)
+        if not matches or not matches[0].elements:
+            return None
+        child = matches[0].elements[-1]
+        return {"tag": child.tag, "attrs": child.attrs}
+
+    def contains(self, outer, inner):
+        """True if the first ``outer`` match contains the first ``inner``."""
+        outers = select(self.document, outer)
+        inners = select(self.document, inner)
+        return bool(outers and inners and outers[0].contains(inners[0]))
+
+
+_BROWSER_QUERY_JS = """
+([op, args]) => {
+    const root = (within, index) => {
+        if (within === null) return document;
+        const el = document.querySelectorAll(within)[index];
+        if (!el) return null;
+        return el.content instanceof DocumentFragment ? el.content : el;
+    };
+    const first = (selector) => document.querySelector(selector);
+    if (op === 'count') {
+        const scope = root(args[1], args[2]);
+        return scope ? scope.querySelectorAll(args[0]).length : 0;
+    }
+    if (op === 'text') {
+        const el = first(args[0]);
+        return el ? el.innerText.split(/\\s+/).filter(Boolean).join(' ') : null;
+    }
+    if (op === 'parent_tag') {
+        const el = first(args[0]);
+        return el && el.parentElement ? el.parentElement.tagName.toLowerCase() : null;
+    }
+    if (op === 'last_child') {
+        const el = first(args[0]);
+        const child = el && el.lastElementChild;
+        if (!child) return null;
+        const attrs = {};
+        for (const attr of child.attributes) attrs[attr.name] = attr.value;
+        return {tag: child.tagName.toLowerCase(), attrs};
+    }
+    if (op === 'contains') {
+        const outer = first(args[0]);
+        const inner = first(args[1]);
+        return Boolean(outer && inner && outer.contains(inner));
+    }
+    throw new Error('unknown query ' + op);
+}
+"""
+
+
+class BrowserQueries:
+    """The same DOM queries answered from a live Playwright page."""
+
+    def __init__(self, page):
+        self.page = page
+
+    def _query(self, op, *args):
+        return self.page.evaluate(_BROWSER_QUERY_JS, [op, list(args)])
+
+    def count(self, selector, within=None, index=0):
+        return self._query("count", selector, within, index)
+
+    def text(self, selector):
+        return self._query("text", selector)
+
+    def parent_tag(self, selector):
+        return self._query("parent_tag", selector)
+
+    def last_child(self, selector):
+        return self._query("last_child", selector)
+
+    def contains(self, outer, inner):
+        return self._query("contains", outer, inner)
+
+
+class ParityQueries:
+    """Answers every query both ways and fails if they disagree."""
+
+    def __init__(self, static, browser):
+        self.static = static
+        self.browser = browser
+
+    def __getattr__(self, name):
+        static_query = getattr(self.static, name)
+        browser_query = getattr(self.browser, name)
+
+        def query(*args, **kwargs):
+            static_value = static_query(*args, **kwargs)
+            browser_value = browser_query(*args, **kwargs)
+            if static_value != browser_value:
+                raise AssertionError(
+                    f"Static/browser parity mismatch for {name}{args}: "
+                    f"static={static_value!r} browser={browser_value!r}"
+                )
+            return browser_value
+
+        return query
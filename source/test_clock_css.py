@@ -1,45 +1,25 @@
-import unittest
-from playwright.sync_api import sync_playwright
 from gradescope_utils.autograder_utils.decorators import weight, visibility
 
+from grader_base import BrowserTestCase
 
-class TestWorldClockCSS(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        """Set up Playwright and browser instance before all tests."""
-        cls.playwright = sync_playwright().start()
-        cls.browser = cls.playwright.firefox.launch(headless=True)
-        cls.page = cls.browser.new_page()
-        cls.page.set_viewport_size({"width": 1024, "height": 768})
 
-    @classmethod
-    def tearDownClass(cls):
-        """Clean up after all tests are done."""
-        cls.browser.close()
-        cls.playwright.stop()
-
-    def setUp(self):
-        """Navigate to the world clock page before each test."""
-        self.page.goto("http://localhost:6543/world-clock")
+class TestWorldClockCSS(BrowserTestCase):
+    ROUTE = "/world-clock"
+    VIEWPORT = {"width": 1024, "height": 768}
+    # Fonts stay: they size the grid tracks the tests check.
+    BLOCK_RESOURCE_TYPES = ("image", "media")
+    STYLE_SPEC = """
+        input[type="submit"]: backgroundColor
+        input[type="submit"]:hover: backgroundColor
+        #clocks: display, gridTemplateColumns, gridTemplateRows, gridAutoFlow
+    """
 
     @weight(3)
     @visibility("visible")
     def test_01_input_background_color(self):
         """[Extra] Test if input elements have pink background color"""
-        # Get computed style for both text and number inputs
-        background_colors = self.page.evaluate(
-            """
-            () => {
-                const inputs = document.querySelectorAll('input[type="submit"]');
-                return Array.from(inputs).map(input =>
-                    window.getComputedStyle(input).backgroundColor
-                );
-            }
-        """
-        )
-
         # Check if all inputs have pink background
-        for color in background_colors:
+        for color in self.styles.all('input[type="submit"]', "backgroundColor"):
             self.assertEqual(
                 color.lower(),
                 "rgb(255, 192, 203)",  # pink in RGB
@@ -50,24 +30,10 @@ class TestWorldClockCSS(unittest.TestCase):
     @visibility("visible")
     def test_02_input_hover_color(self):
         """[Extra] Test if input elements have aqua background color on hover"""
-        # Get all text and number inputs
-        inputs = self.page.locator('input[type="submit"]')
-
-        # Test each input's hover state
-        for i in range(inputs.count()):
-            input_elem = inputs.nth(i)
-
-            # Hover over the input
-            input_elem.hover()
-            self.page.wait_for_timeout(100)  # Small delay to ensure hover is applied
-
-            # Get the computed background color after hover
-            hover_color = input_elem.evaluate(
-                """element =>
-                window.getComputedStyle(element).backgroundColor
-            """
-            )
+        # Background of each submit input in its :hover state
+        hover_colors = self.styles.all('input[type="submit"]:hover', "backgroundColor")
 
+        for i, hover_color in enumerate(hover_colors):
             self.assertEqual(
                 hover_color.lower(),
                 "rgb(0, 255, 255)",  # aqua in RGB
@@ -78,21 +44,7 @@ class TestWorldClockCSS(unittest.TestCase):
     @visibility("visible")
     def test_03_clock_grid_layout(self):
         """[Extra] Test if clocks use CSS grid with correct properties"""
-        # Check grid properties using JavaScript evaluation
-        grid_properties = self.page.evaluate(
-            """
-            () => {
-                const clocksContainer = document.querySelector('#clocks');
-                const styles = window.getComputedStyle(clocksContainer);
-                return {
-                    display: styles.display,
-                    gridTemplateColumns: styles.gridTemplateColumns,
-                    gridTemplateRows: styles.gridTemplateRows,
-                    gridAutoFlow: styles.gridAutoFlow
-                };
-            }
-        """
-        )
+        grid_properties = self.styles.first("#clocks")
 
         # Check if display is grid
         self.assertEqual(
@@ -1,38 +1,17 @@
-import unittest
-from playwright.sync_api import sync_playwright
 from gradescope_utils.autograder_utils.decorators import weight
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
+from grader_base import BrowserTestCase
 
-class TestWorldClockJavaScript(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        """Set up Playwright and browser instance before all tests."""
-        cls.playwright = sync_playwright().start()
-        cls.browser = cls.playwright.firefox.launch(headless=True)
-        cls.page = cls.browser.new_page()
-
-    @classmethod
-    def tearDownClass(cls):
-        """Clean up after all tests are done."""
-        cls.browser.close()
-        cls.playwright.stop()
-
-    def setUp(self):
-        """Navigate to the world clock page and wait for it to load before each test"""
-        self.page.goto("http://localhost:6543/world-clock")
-
-        # try:
-        #     # Wait for timezone data to be loaded
-        #     self.page.wait_for_function(
-        #         """
-        #         () => {
-        #             return window.time_diffs !== undefined;
-        #         }
-        #     """,
-        #         timeout=5000,
-        #     )
-        # except TimeoutError:
-        #     self.fail("time_diffs is undefined")
+
+class TestWorldClockJavaScript(BrowserTestCase):
+    ROUTE = "/world-clock"
+    BLOCK_RESOURCE_TYPES = ("image", "font", "media")
+    # Every test fills in and submits forms.
+    MUTATES_PAGE = True
+    # The clocks show the virtual time, so what they show does not depend
+    # on how long the page took to load.
+    VIRTUAL_CLOCK = True
 
     @weight(5)
     def test_01_empty_form_submission(self):
@@ -52,7 +31,7 @@ class TestWorldClockJavaScript(unittest.TestCase):
         # Verify no errors occurred
         self.assertEqual(
             self.page.url,
-            "http://localhost:6543/world-clock",
+            self.url("/world-clock"),
             "Page should remain on same URL after empty form submission",
         )
 
@@ -81,12 +60,15 @@ class TestWorldClockJavaScript(unittest.TestCase):
 
         timezone_input.fill("PST")
         timezone_form.locator("input[type='submit']").click()
+        # Fire the timers a page may render new clocks from.
+        self.advance(1000)
 
+        timeout = self.timeouts.operation_ms(at_least=5000)
         try:
-            # Wait for the clock to be added with 5 second timeout
-            self.page.wait_for_selector("ul#clocks li", timeout=5000)
-        except TimeoutError:
-            self.fail("Clock element was not added within 5 seconds")
+            # Wait for the clock to be added, at least 5 seconds
+            self.page.wait_for_selector("ul#clocks li", timeout=timeout)
+        except PlaywrightTimeoutError:
+            self.fail(f"Clock element was not added (timed out after {timeout} ms)")
 
         # Verify clock was added with correct structure
         clocks = self.page.locator("ul#clocks li")
@@ -117,12 +99,15 @@ class TestWorldClockJavaScript(unittest.TestCase):
         timezone_input = timezone_form.locator("input[type='text']")
         timezone_input.fill("PST")
         timezone_form.locator("input[type='submit']").click()
+        # Fire the timers a page may render new clocks from.
+        self.advance(1000)
 
+        timeout = self.timeouts.operation_ms(at_least=5000)
         try:
-            # Wait for clock to be added with 5 second timeout
-            self.page.wait_for_selector("ul#clocks li", timeout=5000)
-        except TimeoutError:
-            self.fail("Clock element was not added within 5 seconds")
+            # Wait for the clock to be added, at least 5 seconds
+            self.page.wait_for_selector("ul#clocks li", timeout=timeout)
+        except PlaywrightTimeoutError:
+            self.fail(f"Clock element was not added (timed out after {timeout} ms)")
 
         # Submit valid index to remove
         index_form = self.page.locator("form").nth(1)
@@ -147,9 +132,15 @@ class TestWorldClockJavaScript(unittest.TestCase):
         timezone_input = timezone_form.locator("input[type='text']")
         timezone_input.fill("PST")
         timezone_form.locator("input[type='submit']").click()
+        # Fire the timers a page may render new clocks from.
+        self.advance(1000)
 
-        # Wait for clock to be added
-        self.page.wait_for_selector("ul#clocks li")
+        timeout = self.timeouts.operation_ms(at_least=5000)
+        try:
+            # Wait for the clock to be added, at least 5 seconds
+            self.page.wait_for_selector("ul#clocks li", timeout=timeout)
+        except PlaywrightTimeoutError:
+            self.fail(f"Clock element was not added (timed out after {timeout} ms)")
 
         # Submit invalid index
         index_form = self.page.locator("form").nth(1)
@@ -1,11 +1,176 @@
+import argparse
+import os
+import time
 import unittest
-from gradescope_utils.autograder_utils.json_test_runner import JSONTestRunner
 
-if __name__ == "__main__":
+import failure_trace
+import grader_base
+import incremental
+import log_capture
+import network
+import preflight
+import results_metadata
+import server_supervisor
+import timing
+from browser_pool import get_pool, shutdown_pool
+from grading_runner import GradingTestRunner
+from parallel_runner import iter_tests, run_parallel
+
+RESULTS_PATH = "/autograder/results/results.json"
+# The submission being graded and Gradescope's metadata about earlier ones.
+SUBMISSION_DIR = "/autograder/submission"
+METADATA_PATH = "/autograder/submission_metadata.json"
+# Written by wait_for_server.py from run_autograder.
+SERVER_METRICS_PATH = "/autograder/source/server_ready.json"
+# Written by server_supervisor.py while the server runs.
+SERVER_LOG_PATH = "/autograder/source/fastapi.log"
+SERVER_RESOURCES_PATH = "/autograder/source/server_resources.json"
+# run_autograder exports when grading began so wall time covers server start.
+STARTED_AT = float(os.environ.get("AUTOGRADER_STARTED_AT", time.time()))
+
+# Which suites run and which reuse earlier results (see incremental.py).
+plan = None
+# When the submission being graded started; set by ``grade``.
+started_at = STARTED_AT
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the autograder suites")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("AUTOGRADER_WORKERS", "1")),
+        help="number of worker processes (1 runs the suites serially)",
+    )
+    parser.add_argument(
+        "--split",
+        choices=("class", "module"),
+        default=os.environ.get("AUTOGRADER_SPLIT", "class"),
+        help="unit of work handed to each worker",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=grader_base.BASE_URL,
+        help="where the student's server listens (default %(default)s)",
+    )
+    parser.add_argument(
+        "--submission",
+        default=SUBMISSION_DIR,
+        help="the submission's files, for incremental regrading (default %(default)s)",
+    )
+    parser.add_argument(
+        "--metadata",
+        default=METADATA_PATH,
+        help="submission metadata with earlier results (default %(default)s)",
+    )
+    return parser.parse_args()
+
+
+def post_process(results):
+    """Fill in extra_data and the timing summary, then merge reused results."""
+    results_metadata.post_processor(results)
+    results["extra_data"]["timing"] = timing.run_summary(results, started_at)
+    if plan is not None:
+        plan.merge(results)
+    # Tell the student if their server was restarted or stopped mid-run.
+    notice = server_supervisor.results_entry(SERVER_RESOURCES_PATH)
+    if notice is not None:
+        results["tests"].append(notice)
+
+
+def grade(
+    base_url,
+    workers=1,
+    split="class",
+    started=STARTED_AT,
+    keep_browsers=False,
+    submission=SUBMISSION_DIR,
+    metadata=METADATA_PATH,
+    results_path=RESULTS_PATH,
+):
+    """Run the suites against the server at ``base_url`` into ``results_path``.
+
+    ``submission`` is the directory of the submission being graded and
+    ``metadata`` its submission_metadata.json; incremental.py compares them
+    with the earlier results.
+
+    ``keep_browsers`` leaves the browsers running for the next call, which
+    is how grader_daemon.py stays warm between submissions.
+    """
+    global plan, started_at
+    started_at = started
+    grader_base.set_base_url(base_url)
+    # Failing tests get what the server printed while they ran.
+    log_capture.watch(SERVER_LOG_PATH)
+    network.reset()
+    failure_trace.reset()
+    # Browsers kept from an earlier run count only what this run uses.
+    get_pool().reset_stats()
+
     # unittest.main()
     suite = unittest.defaultTestLoader.discover(
         start_dir=".",  # Current directory
         pattern="test_*.py",  # Files starting with test_
     )
-    with open("/autograder/results/results.json", "w") as f:
-        JSONTestRunner(visibility="visible", stream=f).run(suite)
+
+    results_metadata.register_json_file("server", SERVER_METRICS_PATH)
+    results_metadata.register_json_file("server_resources", SERVER_RESOURCES_PATH)
+
+    # Probe every route the suites use; suites whose route is missing fail
+    # their tests at once instead of timing out in the browser.
+    preflight.run_preflight(grader_base.BASE_URL, preflight.required_routes(iter_tests(suite)))
+    results_metadata.register("preflight", preflight.summary)
+    # Blocked/cached request counts; parallel runs merge the workers' counts.
+    results_metadata.register("network", network.summary)
+
+    # Suites whose routes, assets and tests are unchanged since the previous
+    # submission keep its results; only the rest run.
+    plan = incremental.Plan(
+        list(iter_tests(suite)),
+        grader_base.BASE_URL,
+        submission,
+        incremental.previous_manifest(metadata),
+    )
+    suite = plan.rerun_suite(suite)
+
+    if workers > 1:
+        # Each worker launches its own browser; the pool stats for every
+        # worker are merged into extra_data.parallel.
+        with open(results_path, "w") as f:
+            run_parallel(
+                suite,
+                workers,
+                f,
+                visibility="visible",
+                by=split,
+                post_processor=post_process,
+            )
+    else:
+        # Launch Firefox once for every suite; each TestCase class gets its
+        # own BrowserContext from the pool.
+        pool = get_pool()
+        if suite.countTestCases():
+            pool.start()
+        results_metadata.register("browser_pool", pool.stats)
+
+        try:
+            with open(results_path, "w") as f:
+                GradingTestRunner(
+                    visibility="visible",
+                    stream=f,
+                    post_processor=post_process,
+                ).run(suite)
+        finally:
+            if not keep_browsers:
+                shutdown_pool()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    grade(
+        args.base_url,
+        args.workers,
+        args.split,
+        submission=args.submission,
+        metadata=args.metadata,
+    )
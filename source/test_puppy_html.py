@@ -1,25 +1,10 @@
-import unittest
-from playwright.sync_api import sync_playwright
 from gradescope_utils.autograder_utils.decorators import weight
 
+from grader_base import BrowserTestCase, static_check
 
-class TestPuppyPongPage(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        """Set up Playwright and browser instance before all tests."""
-        cls.playwright = sync_playwright().start()
-        cls.browser = cls.playwright.firefox.launch(headless=True)
-        cls.page = cls.browser.new_page()
 
-    @classmethod
-    def tearDownClass(cls):
-        """Clean up after all tests are done."""
-        cls.browser.close()
-        cls.playwright.stop()
-
-    def setUp(self):
-        """Navigate to the puppy pong page before each test"""
-        self.page.goto("http://localhost:6543/puppy-pong")
+class TestPuppyPongPage(BrowserTestCase):
+    ROUTE = "/puppy-pong"
 
     @weight(5)
     def test_01_score_and_time_paragraphs(self):
@@ -48,8 +33,11 @@ class TestPuppyPongPage(unittest.TestCase):
     def test_02_puppy_image(self):
         """Test if puppy image exists with correct attributes"""
         # Find image element
-        img = self.page.locator("img[src*='puppy.jpg']")
-        self.assertEqual(img.count(), 1, "Page should have exactly one puppy image")
+        self.assertEqual(
+            self.dom.count("img[src*='puppy.jpg']"),
+            1,
+            "Page should have exactly one puppy image",
+        )
 
         # Verify image attributes using JavaScript evaluation
         img_attributes = self.page.evaluate(
@@ -72,48 +60,40 @@ class TestPuppyPongPage(unittest.TestCase):
         )
 
     @weight(5)
+    @static_check
     def test_03_deathzone_and_player(self):
         """Test if deathzone div and player span exist with correct IDs"""
         # Check deathzone div
-        deathzone = self.page.locator("div#deathzone")
         self.assertEqual(
-            deathzone.count(), 1, "Page should have exactly one div with id 'deathzone'"
+            self.dom.count("div#deathzone"),
+            1,
+            "Page should have exactly one div with id 'deathzone'",
         )
 
         # Check player span
-        player = self.page.locator("span#player")
         self.assertEqual(
-            player.count(), 1, "Page should have exactly one span with id 'player'"
+            self.dom.count("span#player"),
+            1,
+            "Page should have exactly one span with id 'player'",
         )
 
-        # Verify player is inside deathzone using JavaScript evaluation
-        player_in_deathzone = self.page.evaluate(
-            """
-            () => {
-                const player = document.querySelector('#player');
-                const deathzone = document.querySelector('#deathzone');
-                return deathzone.contains(player);
-            }
-        """
-        )
+        # Verify player is inside deathzone
         self.assertTrue(
-            player_in_deathzone, "Player span should be inside deathzone div"
+            self.dom.contains("#deathzone", "#player"),
+            "Player span should be inside deathzone div",
         )
 
     @weight(5)
+    @static_check
     def test_04_required_resources(self):
         """Test if required CSS and script are included"""
         # Check for CSS link in head
-        css_in_head = self.page.evaluate(
-            """
-            () => {
-                const cssLink = document.querySelector('link[href*="puppy_pong.css"]');
-                return cssLink && cssLink.parentNode.tagName.toLowerCase() === 'head';
-            }
-        """
-        )
+        css_in_head = self.dom.parent_tag('link[href*="puppy_pong.css"]') == "head"
         self.assertTrue(css_in_head, "CSS link should be in the head element")
 
         # Check for script element
-        script = self.page.locator("script[src*='puppy_pong.js']")
-        self.assertEqual(script.count(), 1, "Page should include puppy_pong.js script")
+        self.assertEqual(
+            self.dom.count("script[src*='puppy_pong.js']"),
+            1,
+            "Page should include puppy_pong.js script",
+        )
@@ -0,0 +1,138 @@
+import json
+import os
+import unittest
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+from gradescope_utils.autograder_utils.decorators import visibility, weight
+
+import grader_base
+import preflight
+from load_driver import run_load
+
+# The suite POSTs to the student's server and loads it for several seconds,
+# so it only runs when asked for (AUTOGRADER_LOAD_SUITE=1).
+ENABLED = os.environ.get("AUTOGRADER_LOAD_SUITE", "0") == "1"
+# How hard the /stock endpoints are driven; see load_driver.py.
+CLIENTS = int(os.environ.get("AUTOGRADER_LOAD_CLIENTS", "8"))
+REQUESTS_PER_CLIENT = int(os.environ.get("AUTOGRADER_LOAD_REQUESTS", "60"))
+# Optional rubric thresholds, checked per endpoint when set.
+MIN_RPS = os.environ.get("AUTOGRADER_LOAD_MIN_RPS")
+MAX_P99_MS = os.environ.get("AUTOGRADER_LOAD_MAX_P99_MS")
+MAX_ERROR_RATE = os.environ.get("AUTOGRADER_LOAD_MAX_ERROR_RATE")
+
+STOCK_PATHS = ("/stock", "/stock/page", "/stock/1", "/stock/2", "/stock/3")
+
+
+def _endpoint(path):
+    return "/stock/{n}" if path[len("/stock/"):].isdigit() else path
+
+
+def _upstream_requests():
+    """API requests the mock stock API has answered, or None without one."""
+    api = os.environ.get("STOCK_API_URL")
+    if not api:
+        return None
+    try:
+        with urlopen(api + "/stats", timeout=5) as response:
+            return json.load(response)["requests"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+@unittest.skipUnless(ENABLED, "set AUTOGRADER_LOAD_SUITE=1 to run the load suite")
+class TestStockLoad(unittest.TestCase):
+    """Throughput, latency and errors of /stock under concurrent clients.
+
+    Hidden and worth no points; the measurements are in each test's output
+    and ``extra_data.load``. Setting AUTOGRADER_LOAD_MIN_RPS,
+    AUTOGRADER_LOAD_MAX_P99_MS or AUTOGRADER_LOAD_MAX_ERROR_RATE fails the
+    endpoints that miss them. Skipped tests are left out of results.json,
+    so without AUTOGRADER_LOAD_SUITE=1 the suite leaves no trace.
+    """
+
+    ROUTE = "/stock"
+    REQUIRED_ROUTES = ("/stock", "/stock/1")
+
+    @classmethod
+    def required_routes(cls):
+        return cls.REQUIRED_ROUTES
+
+    @classmethod
+    def setUpClass(cls):
+        cls.report = None
+        cls.failure = preflight.failure_for(cls.required_routes())
+        if cls.failure is not None:
+            return
+        base_url = grader_base.BASE_URL
+        # Fill the three stocks once so /stock/page and /stock/{n} have data.
+        # A failure must not escape setUpClass: its error would be reported
+        # without the tests' hidden visibility.
+        form = urlencode({"symbol1": "AAPL", "symbol2": "GOOGL", "symbol3": "MSFT"})
+        try:
+            with urlopen(base_url + "/stock", data=form.encode(), timeout=30) as response:
+                response.read()
+        except HTTPError as error:
+            cls.failure = f"POST /stock returned {error.code} {error.reason}"
+            return
+        except OSError as error:
+            cls.failure = f"POST /stock failed: {getattr(error, 'reason', error)}"
+            return
+        upstream_before = _upstream_requests()
+        cls.report = run_load(
+            base_url,
+            STOCK_PATHS,
+            clients=CLIENTS,
+            requests_per_client=REQUESTS_PER_CLIENT,
+            group=_endpoint,
+        )
+        upstream_after = _upstream_requests()
+        if upstream_before is not None and upstream_after is not None:
+            # A server that caches its lookups makes none while only read.
+            cls.report["upstream_requests"] = upstream_after - upstream_before
+
+    def check_endpoint(self, endpoint):
+        if self.failure is not None:
+            self.fail(self.failure)
+        stats = self.report["endpoints"][endpoint]
+        self.extra_data = {"load": dict(self.report, endpoints={endpoint: stats})}
+        print(
+            f"{endpoint}: {stats['throughput_rps']} requests/s with {CLIENTS} clients, "
+            f"p50 {stats['p50_ms']} ms, p99 {stats['p99_ms']} ms, "
+            f"{stats['errors']} of {stats['requests']} requests failed"
+        )
+        if "upstream_requests" in self.report:
+            print(f"Stock API requests during the load: {self.report['upstream_requests']}")
+        if MIN_RPS is not None:
+            self.assertGreaterEqual(
+                stats["throughput_rps"], float(MIN_RPS), f"{endpoint} should serve {MIN_RPS} requests/s"
+            )
+        if MAX_P99_MS is not None:
+            self.assertLessEqual(
+                stats["p99_ms"], float(MAX_P99_MS), f"{endpoint} p99 latency should be under {MAX_P99_MS} ms"
+            )
+        if MAX_ERROR_RATE is not None:
+            self.assertLessEqual(
+                stats["error_rate"],
+                float(MAX_ERROR_RATE),
+                f"{endpoint} error rate should be at most {MAX_ERROR_RATE}",
+            )
+
+    @weight(0)
+    @visibility("hidden")
+    def test_01_stock_form_under_load(self):
+        """Test /stock under concurrent clients"""
+        self.check_endpoint("/stock")
+
+    @weight(0)
+    @visibility("hidden")
+    def test_02_stock_page_under_load(self):
+        """Test /stock/page under concurrent clients"""
+        self.check_endpoint("/stock/page")
+
+    @weight(0)
+    @visibility("hidden")
+    def test_03_stock_json_under_load(self):
+        """Test /stock/{n} under concurrent clients"""
+        self.check_endpoint("/stock/{n}")
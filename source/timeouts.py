@@ -0,0 +1,89 @@
+"""Per-suite time budgets and the page timeouts derived from them.
+
+Playwright's 30 s default lets one broken selector eat half a minute, and
+nothing bounds a whole run. Each suite instead gets a ``SuiteBudget``:
+
+- until the suite's route has loaded once, operations get ``COLD_MS``, so a
+  slow first render of a correct submission still passes;
+- once it has, actions and locators get ``WARM_MS``: the server is known
+  to answer, so a locator that still finds nothing after that is a wrong
+  selector, not a slow server. Navigations keep ``COLD_MS``, since each one
+  waits on the server again;
+- neither ever exceeds what is left of the suite's ``budget_ms``; once the
+  budget is spent, the remaining tests fail straight away.
+
+A test that waits for something explicitly passes the wait it needs as
+``operation_ms(at_least=...)``, which never hands out less.
+
+All values are in milliseconds and can be overridden through the
+AUTOGRADER_SUITE_BUDGET_MS, AUTOGRADER_COLD_TIMEOUT_MS and
+AUTOGRADER_WARM_TIMEOUT_MS environment variables.
+"""
+
+import os
+import re
+import time
+
+SUITE_BUDGET_MS = int(os.environ.get("AUTOGRADER_SUITE_BUDGET_MS", "60000"))
+COLD_MS = int(os.environ.get("AUTOGRADER_COLD_TIMEOUT_MS", "15000"))
+WARM_MS = int(os.environ.get("AUTOGRADER_WARM_TIMEOUT_MS", "3000"))
+# Shortest timeout handed out while any budget is left.
+MIN_MS = 250
+
+_PLAYWRIGHT_TIMEOUT = re.compile(r"Timeout (\d+)ms exceeded")
+
+
+class SuiteBudget:
+    def __init__(self, budget_ms=None, cold_ms=None, warm_ms=None):
+        self.budget_ms = SUITE_BUDGET_MS if budget_ms is None else budget_ms
+        self.cold_ms = COLD_MS if cold_ms is None else cold_ms
+        self.warm_ms = WARM_MS if warm_ms is None else warm_ms
+        self.started = time.monotonic()
+        self.ready = False
+
+    def mark_ready(self):
+        """Record that the suite's route has loaded once."""
+        self.ready = True
+
+    def elapsed_ms(self):
+        return (time.monotonic() - self.started) * 1000
+
+    def remaining_ms(self):
+        return max(0.0, self.budget_ms - self.elapsed_ms())
+
+    def exhausted(self):
+        return self.remaining_ms() < MIN_MS
+
+    def operation_ms(self, at_least=0):
+        """Timeout for the next page operation, never less than ``at_least``."""
+        base = self.warm_ms if self.ready else self.cold_ms
+        return int(max(MIN_MS, at_least, min(base, self.remaining_ms())))
+
+    def navigation_ms(self):
+        """Timeout for the next navigation; always the cold one."""
+        return int(max(MIN_MS, min(self.cold_ms, self.remaining_ms())))
+
+    def apply(self, page):
+        """Make the budget's timeouts the page's defaults."""
+        ms = self.operation_ms()
+        page.set_default_timeout(ms)
+        page.set_default_navigation_timeout(self.navigation_ms())
+        return ms
+
+    def summary(self):
+        return {
+            "budget_ms": self.budget_ms,
+            "used_ms": round(self.elapsed_ms(), 1),
+            "ready": self.ready,
+            "exhausted": self.exhausted(),
+        }
+
+
+def describe_timeout(error):
+    """Student-facing message for a Playwright TimeoutError."""
+    message = str(error).strip()
+    first_line = message.splitlines()[0] if message else "operation timed out"
+    match = _PLAYWRIGHT_TIMEOUT.search(message)
+    if match is None:
+        return f"Timed out: {first_line}"
+    return f"Timed out after {match.group(1)} ms: {first_line}"
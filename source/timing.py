@@ -0,0 +1,142 @@
+"""Per-test phase timings for the results metadata.
+
+The runner starts a timer for every test; page operations and explicit
+``phase(...)`` blocks add their durations to it, and requests the page
+sends to the student's server add their time-to-first-byte. All figures
+are in milliseconds and end up in each test's ``extra_data.timing``.
+"""
+
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Page methods whose time is recorded, and the phase they count towards.
+PAGE_PHASES = {
+    "goto": "goto",
+    "reload": "goto",
+    "evaluate": "evaluate",
+    "wait_for_selector": "wait",
+    "wait_for_function": "wait",
+    "wait_for_timeout": "wait",
+    "wait_for_load_state": "wait",
+    "wait_for_url": "wait",
+}
+
+
+class TestTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.server_ms = 0.0
+        self.server_requests = 0
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds * 1000
+
+    def summary(self):
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "phases_ms": {name: round(ms, 1) for name, ms in self.phases.items()},
+            "server_ms": round(self.server_ms, 1),
+            "server_requests": self.server_requests,
+        }
+
+
+_current = None
+# Time taken by phases nested in each open ``phase`` block, innermost last.
+_open_phases = []
+
+
+def start_test():
+    global _current
+    _current = TestTimer()
+
+
+def stop_test():
+    global _current
+    _current = None
+
+
+def current():
+    """The running test's timer, or None between tests."""
+    return _current
+
+
+@contextmanager
+def phase(name):
+    """Add the time spent in the block to phase ``name`` of the current test.
+
+    Time spent in phases nested in the block counts towards those only, so
+    the navigation a setup block makes is ``goto`` time, not setup time too.
+    """
+    started = time.perf_counter()
+    nested = [0.0]
+    _open_phases.append(nested)
+    try:
+        yield
+    finally:
+        _open_phases.pop()
+        seconds = time.perf_counter() - started
+        if _open_phases:
+            _open_phases[-1][0] += seconds
+        if _current is not None:
+            _current.add(name, seconds - nested[0])
+
+
+def _timed(method, name):
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with phase(name):
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
+def instrument_page(page, origin):
+    """Time ``page``'s navigation, evaluate and wait calls.
+
+    Requests to ``origin`` (the student's server) also record how long the
+    server took to start answering them.
+    """
+    for method, name in PAGE_PHASES.items():
+        setattr(page, method, _timed(getattr(page, method), name))
+
+    def record_request(request):
+        if _current is None or not request.url.startswith(origin):
+            return
+        timing = request.timing
+        if timing["requestStart"] >= 0 and timing["responseStart"] >= 0:
+            _current.server_ms += timing["responseStart"] - timing["requestStart"]
+            _current.server_requests += 1
+
+    page.on("requestfinished", record_request)
+    return page
+
+
+def run_summary(results, started):
+    """Run-level timing from a finished results dict.
+
+    ``started`` is the epoch time the grading run began (run_autograder
+    exports it as AUTOGRADER_STARTED_AT).
+    """
+    extra = results.get("extra_data", {})
+    server = extra.get("server") or {}
+    if "browser_pool" in extra:
+        pools = [extra["browser_pool"]]
+    else:
+        workers = extra.get("parallel", {}).get("per_worker", [])
+        pools = [worker.get("browser_pool", {}) for worker in workers]
+    tests = [test.get("extra_data", {}).get("timing", {}) for test in results["tests"]]
+    phases = {}
+    for test in tests:
+        for name, ms in test.get("phases_ms", {}).items():
+            phases[name] = phases.get(name, 0.0) + ms
+    return {
+        "wall_seconds": round(time.time() - started, 3),
+        "server_startup_seconds": server.get("time_to_ready_seconds"),
+        "browser_launches": sum(p.get("browser_launches", 0) for p in pools),
+        "browser_launch_seconds": round(sum(p.get("launch_seconds", 0) for p in pools), 3),
+        "tests_seconds": round(sum(t.get("total_ms", 0) for t in tests) / 1000, 3),
+        "phase_seconds": {name: round(ms / 1000, 3) for name, ms in phases.items()},
+        "server_seconds": round(sum(t.get("server_ms", 0) for t in tests) / 1000, 3),
+    }
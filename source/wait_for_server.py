@@ -0,0 +1,116 @@
+"""Wait until the student's server answers HTTP, or report why it never will.
+
+Replaces the ``curl`` + ``sleep 1`` loop in run_autograder. The probe watches
+the server PID and the port together: it returns as soon as the server
+responds (polling with backoff capped at 100 ms) and fails immediately if
+the process exits, instead of waiting out the whole timeout.
+
+Exit status: 0 ready, 1 the server process exited, 2 timed out.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import time
+from urllib.parse import urlsplit
+
+READY = 0
+EXITED = 1
+TIMED_OUT = 2
+
+STATUS_NAMES = {READY: "ready", EXITED: "exited", TIMED_OUT: "timed_out"}
+
+INITIAL_DELAY = 0.01
+MAX_DELAY = 0.1
+
+
+def process_alive(pid):
+    """True while ``pid`` exists and is not a zombie."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # The state field follows the parenthesised command name.
+            state = f.read().rsplit(")", 1)[1].split()[0]
+    except (OSError, IndexError):
+        return True
+    return state != "Z"
+
+
+def responds(url, timeout=1.0):
+    """True once ``url`` answers with any HTTP response."""
+    parts = urlsplit(url)
+    host = parts.hostname or "localhost"
+    port = parts.port or 80
+    try:
+        # A refused TCP connect is the common case while uvicorn boots; it
+        # is much cheaper than a full HTTP request.
+        with socket.create_connection((host, port), timeout=timeout):
+            pass
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        try:
+            conn.request("GET", parts.path or "/")
+            conn.getresponse().read()
+        finally:
+            conn.close()
+    except (OSError, http.client.HTTPException):
+        return False
+    return True
+
+
+def wait_for_server(url, pid=None, timeout=30.0):
+    """Poll until ready; return ``(status, seconds_waited, attempts)``."""
+    started = time.monotonic()
+    delay = INITIAL_DELAY
+    attempts = 0
+    while True:
+        attempts += 1
+        if responds(url):
+            return READY, time.monotonic() - started, attempts
+        if pid is not None and not process_alive(pid):
+            return EXITED, time.monotonic() - started, attempts
+        elapsed = time.monotonic() - started
+        if elapsed >= timeout:
+            return TIMED_OUT, elapsed, attempts
+        time.sleep(min(delay, timeout - elapsed))
+        delay = min(delay * 2, MAX_DELAY)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:6543/docs")
+    parser.add_argument("--pid", type=int, help="PID of the server process")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--metrics", help="write time-to-ready as JSON here")
+    args = parser.parse_args()
+
+    status, waited, attempts = wait_for_server(args.url, args.pid, args.timeout)
+    outcome = STATUS_NAMES[status]
+    if args.metrics:
+        with open(args.metrics, "w") as f:
+            json.dump(
+                {
+                    "status": outcome,
+                    "time_to_ready_seconds": round(waited, 3) if status == READY else None,
+                    "waited_seconds": round(waited, 3),
+                    "probe_attempts": attempts,
+                },
+                f,
+            )
+    if status == READY:
+        print(f"Server ready after {waited:.3f}s ({attempts} probes)")
+    elif status == EXITED:
+        print(f"Server process {args.pid} exited after {waited:.3f}s before it was ready")
+    else:
+        print(f"Server did not respond within {args.timeout:.0f}s")
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "source"))
+
+from computed_styles import collect_styles  # noqa: E402
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<style>
+  body { color: rgb(0, 0, 0); }
+  .card:hover { color: rgb(0, 128, 0); }
+  .card:hover .title { background-color: rgb(255, 0, 0); }
+  form:focus input { color: rgb(255, 0, 0); }
+  input:focus { background-color: rgb(0, 0, 255); }
+  label:hover + input { border-top-color: rgb(255, 0, 0); }
+  button:hover:active { color: rgb(255, 0, 0); }
+</style>
+</head>
+<body>
+  <div class="card"><p class="title">Title</p><p class="body">Body</p></div>
+  <form tabindex="0"><label>Name</label><input type="text"></form>
+  <button>Go</button>
+</body>
+</html>
+"""
+
+SPEC = """
+.title:hover: backgroundColor
+.card .body:hover: color
+input:focus: color, backgroundColor
+input:hover: borderTopColor
+button:active: color
+"""
+
+
+class PseudoStateTest(unittest.TestCase):
+    """Stylesheet resolution of dynamic pseudo-classes, checked by interaction."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            from playwright.sync_api import sync_playwright
+
+            cls.playwright = sync_playwright().start()
+            cls.browser = cls.playwright.firefox.launch()
+        except Exception as error:
+            if getattr(cls, "playwright", None) is not None:
+                cls.playwright.stop()
+            raise unittest.SkipTest(f"no browser to run the page in: {error}")
+        cls.page = cls.browser.new_page()
+        cls.page.set_content(PAGE)
+        # "parity" fails on any difference from really entering the state.
+        cls.styles = collect_styles(cls.page, SPEC, "parity")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.browser.close()
+        cls.playwright.stop()
+
+    def test_rule_on_hovered_ancestor(self):
+        self.assertEqual(self.styles.get(".title:hover", "backgroundColor"), "rgb(255, 0, 0)")
+
+    def test_value_inherited_from_hovered_ancestor(self):
+        self.assertEqual(self.styles.get(".card .body:hover", "color"), "rgb(0, 128, 0)")
+
+    def test_focus_stays_on_the_element(self):
+        self.assertEqual(self.styles.get("input:focus", "backgroundColor"), "rgb(0, 0, 255)")
+        self.assertNotEqual(self.styles.get("input:focus", "color"), "rgb(255, 0, 0)")
+
+    def test_hovered_sibling_does_not_count(self):
+        self.assertNotEqual(self.styles.get("input:hover", "borderTopColor"), "rgb(255, 0, 0)")
+
+    def test_pressed_element_is_hovered(self):
+        self.assertEqual(self.styles.get("button:active", "color"), "rgb(255, 0, 0)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import json
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "source"))
+
+import http_client  # noqa: E402
+
+
+class CookieHandler(BaseHTTPRequestHandler):
+    """Echoes the path and Cookie header; /set/<name> also sets a cookie."""
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path, "cookie": self.headers.get("Cookie", "")})
+        self.send_response(200)
+        if self.path.startswith("/set/"):
+            name = self.path.rsplit("/", 1)[1]
+            self.send_header(
+                "Set-Cookie", f"{name}=set; Path=/; Max-Age=3600; HttpOnly; SameSite=Lax"
+            )
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeContext:
+    """The parts of a Playwright BrowserContext the client uses."""
+
+    def __init__(self, cookies=()):
+        self.jar = list(cookies)
+        self.added = []
+
+    def cookies(self, url):
+        return list(self.jar)
+
+    def add_cookies(self, cookies):
+        self.added.extend(cookies)
+
+
+class GetAllTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), CookieHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://localhost:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.client = http_client.HttpClient(self.base_url)
+        # Record the sessions get_all makes for its worker threads.
+        self.sessions = []
+        new_session = http_client.HttpClient._new_session
+
+        def record():
+            session = new_session()
+            self.sessions.append(session)
+            return session
+
+        self.client._new_session = record
+
+    def test_responses_in_order(self):
+        paths = [f"/echo/{i}" for i in range(20)]
+        responses = self.client.get_all(paths)
+        self.assertEqual([response.json()["path"] for response in responses], paths)
+
+    def test_worker_threads_have_their_own_sessions(self):
+        self.client.get_all([f"/echo/{i}" for i in range(20)])
+        self.assertTrue(self.sessions)
+        self.assertLessEqual(len(self.sessions), http_client.POOL_SIZE)
+        self.assertNotIn(self.client.session, self.sessions)
+        jars = {id(session.cookies) for session in self.sessions}
+        self.assertEqual(len(jars), len(self.sessions))
+        self.assertNotIn(id(self.client.session.cookies), jars)
+
+    def test_client_cookies_are_sent(self):
+        self.client.session.cookies.set("sid", "abc")
+        responses = self.client.get_all([f"/echo/{i}" for i in range(8)])
+        for response in responses:
+            self.assertEqual(response.json()["cookie"], "sid=abc")
+
+    def test_response_cookies_merge_into_client(self):
+        self.client.get_all(["/set/a", "/set/b", "/echo/c"])
+        self.assertEqual(self.client.session.cookies.get("a"), "set")
+        self.assertEqual(self.client.session.cookies.get("b"), "set")
+        response = self.client.get("/echo/after")
+        self.assertEqual(sorted(response.json()["cookie"].split("; ")), ["a=set", "b=set"])
+
+
+class BrowserCookiesTest(GetAllTest):
+    BROWSER_COOKIE = {
+        "name": "sid",
+        "value": "browser",
+        "domain": "localhost",
+        "path": "/",
+        "expires": 4102444800,
+        "httpOnly": True,
+        "secure": False,
+        "sameSite": "Lax",
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.client.context = FakeContext([self.BROWSER_COOKIE])
+
+    def test_browser_cookies_are_sent_with_their_attributes(self):
+        responses = self.client.get_all(["/echo/0", "/echo/1"], browser_cookies=True)
+        for response in responses:
+            self.assertEqual(response.json()["cookie"], "sid=browser")
+        cookie = next(iter(self.client.session.cookies))
+        self.assertEqual(cookie.path, "/")
+        self.assertEqual(cookie.expires, 4102444800)
+        self.assertTrue(cookie.has_nonstandard_attr("HttpOnly"))
+        self.assertEqual(cookie.get_nonstandard_attr("SameSite"), "Lax")
+
+    def test_response_cookies_go_to_the_context_with_their_attributes(self):
+        self.client.get_all(["/set/a", "/echo/1"], browser_cookies=True)
+        self.assertEqual(len(self.client.context.added), 1)
+        added = self.client.context.added[0]
+        self.assertEqual(
+            {key: added[key] for key in ("name", "value", "domain", "path", "httpOnly", "sameSite")},
+            {
+                "name": "a",
+                "value": "set",
+                "domain": "localhost",
+                "path": "/",
+                "httpOnly": True,
+                "sameSite": "Lax",
+            },
+        )
+        self.assertGreater(added["expires"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
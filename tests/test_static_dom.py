@@ -0,0 +1,78 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "source"))
+
+from static_dom import StaticQueries, parse_html  # noqa: E402
+
+CLOCK_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+  <link rel="stylesheet" href="world_clock.css">
+  <template>
+    <li><div class="timezone"></div><div class="offset"></div><div class="time"></div></li>
+    <form><input type="text"></form>
+    <h2>Template heading</h2>
+  </template>
+</head>
+<body>
+  <h2>My Clocks</h2>
+  <form><input type="text"><input type="submit"></form>
+  <form><input type="number"><input type="submit"></form>
+  <ul id="clocks"></ul>
+  <script src="world_clock.js"></script>
+</body>
+</html>
+"""
+
+
+class TemplateTest(unittest.TestCase):
+    def setUp(self):
+        self.dom = StaticQueries(parse_html(CLOCK_PAGE))
+
+    def test_template_contents_are_not_counted(self):
+        self.assertEqual(self.dom.count("form"), 2)
+        self.assertEqual(self.dom.count("h2"), 1)
+        self.assertEqual(self.dom.count("input[type='text']"), 1)
+
+    def test_within_template_queries_its_content(self):
+        self.assertEqual(self.dom.count("template"), 1)
+        self.assertEqual(self.dom.count("form", within="template"), 1)
+        self.assertEqual(self.dom.count("li div.timezone", within="template"), 1)
+        self.assertEqual(self.dom.count("head li", within="template"), 0)
+
+    def test_position_queries_skip_template(self):
+        self.assertEqual(self.dom.text("h2"), "My Clocks")
+        self.assertEqual(self.dom.parent_tag("form"), "body")
+        self.assertIsNone(self.dom.last_child("template"))
+        self.assertEqual(self.dom.last_child("body")["tag"], "script")
+        self.assertEqual(self.dom.text("head"), "")
+
+    def test_within_form_index(self):
+        self.assertEqual(self.dom.count("input[type='number']", within="form", index=1), 1)
+        self.assertEqual(self.dom.count("input", within="form", index=2), 0)
+
+
+class TableTest(unittest.TestCase):
+    def test_rows_get_implicit_tbody(self):
+        dom = StaticQueries(parse_html("<table><tr><td>1<td>2<tr><td>3</table>"))
+        self.assertEqual(dom.count("table > tr"), 0)
+        self.assertEqual(dom.count("table > tbody > tr"), 2)
+        self.assertEqual(dom.count("tr > td"), 3)
+
+    def test_explicit_sections_are_kept(self):
+        dom = StaticQueries(parse_html(
+            "<table><thead><tr><th>a</th></tr></thead>"
+            "<tbody><tr><td>b</td></tr></tbody></table>"
+        ))
+        self.assertEqual(dom.count("tbody"), 1)
+        self.assertEqual(dom.count("thead > tr > th"), 1)
+
+    def test_cell_directly_in_table(self):
+        dom = StaticQueries(parse_html("<table><td>x</td></table>"))
+        self.assertEqual(dom.count("table > tbody > tr > td"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()